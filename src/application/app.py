@@ -5,16 +5,20 @@ from dotenv import load_dotenv
 from langchain.chat_models import ChatOpenAI
 from langchain.embeddings import OpenAIEmbeddings
 from langchain.memory import ConversationBufferMemory
-from langchain.vectorstores.azuresearch import AzureSearch
 
 from config import settings
-from data_ingestion.vector_handlers import AzureSearchAdapter, FAISSAdapter
+from data_ingestion.index_versions import IndexVersionStore, ReloadableVectorStore
+from data_ingestion.partitioned_index import load_faiss_store
+from data_ingestion.shared_index import SHARED_DIR, SharedFAISSAdapter
+from data_ingestion.vector_handlers import AzureSearchAdapter
 from retrieval.graph_router import RetrievalGraph
 from retrieval.retriever import CustomRetrievalQA
 
 load_dotenv("src/config/secrets.env", override=True)
 openai_key = os.getenv("OPENAI_API_KEY")
 
+_vector_store = None
+
 
 def load_vector_store():
     embedding_model = OpenAIEmbeddings(
@@ -22,24 +26,40 @@ def load_vector_store():
     )
 
     if settings.VECTOR_STORE.upper() == "FAISS" or not settings.VECTOR_STORE:
-        faiss_adapter = FAISSAdapter(embedding_model=embedding_model)
-        faiss_adapter.load("faiss.index")
-        return faiss_adapter
-    elif settings.VECTOR_STORE.upper() == "AZURE":
-        azure_search = AzureSearch(
-            azure_search_endpoint=os.getenv("AZURE_SEARCH_ENDPOINT"),
-            azure_search_key=os.getenv("AZURE_SEARCH_KEY"),
-            index_name=os.getenv("AZURE_INDEX_NAME"),
-            embedding_function=embedding_model.embed_query,
+
+        def load_faiss(path: str):
+            if settings.SERVING_MODE == "shared":
+                shared_adapter = SharedFAISSAdapter(embedding_model=embedding_model)
+                shared_adapter.load(os.path.join(path, SHARED_DIR))
+                return shared_adapter
+            return load_faiss_store(
+                path, embedding_model, rerank_factor=settings.RERANK_FACTOR
+            )
+
+        vector_store = ReloadableVectorStore(
+            IndexVersionStore(settings.INDEX_DIR, keep=settings.INDEX_KEEP_VERSIONS),
+            load_faiss,
+            poll_interval=settings.INDEX_RELOAD_INTERVAL,
         )
-        return AzureSearchAdapter(azure_search)
+        vector_store.start_watching()
+        return vector_store
+    elif settings.VECTOR_STORE.upper() in ("AZURE", "AZURE_SEARCH"):
+        return AzureSearchAdapter.from_env(embedding_model)
     else:
         raise ValueError(f"Invalid vector store: {settings.VECTOR_STORE}")
 
 
+def get_vector_store():
+    """Return the process-wide vector store, loading it on first use."""
+    global _vector_store
+    if _vector_store is None:
+        _vector_store = load_vector_store()
+    return _vector_store
+
+
 @cl.on_chat_start
 def setup():
-    vector_store = load_vector_store()
+    vector_store = get_vector_store()
     llm = ChatOpenAI(temperature=0)
 
     memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
@@ -56,24 +76,32 @@ def setup():
     cl.user_session.set("graph", graph)
 
 
+def format_sources(sources) -> str:
+    if not sources:
+        return ""
+    formatted_sources = "\n\n**Sources used:**\n"
+    for i, doc in enumerate(sources, start=1):
+        source_name = doc.metadata.get("source", f"Document {i}")
+        excerpt = doc.page_content.strip().replace("\n", " ")
+        excerpt_preview = excerpt[:200] + ("..." if len(excerpt) > 200 else "")
+        formatted_sources += f"**{source_name}**\n> {excerpt_preview}\n\n"
+    return formatted_sources
+
+
 @cl.on_message
 async def handle_msg(msg: cl.Message):
     graph = cl.user_session.get("graph")
-    response = graph.invoke(msg.content)
-
-    if isinstance(response, dict):
-        answer = response.get("answer", "")
-        sources = response.get("source_documents", [])
-
-        formatted_sources = ""
-        if sources:
-            formatted_sources = "\n\n**Sources used:**\n"
-            for i, doc in enumerate(sources, start=1):
-                source_name = doc.metadata.get("source", f"Document {i}")
-                excerpt = doc.page_content.strip().replace("\n", " ")
-                excerpt_preview = excerpt[:200] + ("..." if len(excerpt) > 200 else "")
-                formatted_sources += f"**{source_name}**\n> {excerpt_preview}\n\n"
-
-        await cl.Message(content=f"{answer}{formatted_sources}").send()
-    else:
-        await cl.Message(content=str(response)).send()
+    response_msg = cl.Message(content="")
+
+    response = {}
+    async for event in graph.astream_answer(msg.content):
+        if "token" in event:
+            await response_msg.stream_token(event["token"])
+        else:
+            response = event
+
+    # Sources are only known to be final once the answer has completed
+    formatted_sources = format_sources(response.get("source_documents", []))
+    if formatted_sources:
+        await response_msg.stream_token(formatted_sources)
+    await response_msg.send()
@@ -12,8 +12,33 @@ with open(CONFIG_PATH, "r") as f:
 
 # Access patterns
 DATA_DIR = config.get("data_dir", "data/")
+CONVERSION_CACHE_DIR = config.get("conversion_cache_dir", DATA_DIR + "conversion_cache")
+JOURNAL_DIR = config.get("journal_dir", DATA_DIR + "ingestion_journal")
+EMBED_BATCH_SIZE = config.get("embed_batch_size", 256)
 TRANSCRIPT_ZIP_URL = config.get("transcript_zip_url")
+# Optional expected SHA-256 of the transcript archive; the ETag MD5 is checked either way
+TRANSCRIPT_ZIP_SHA256 = config.get("transcript_zip_sha256")
+DOWNLOAD_PART_SIZE = config.get("download_part_size", 8 * 1024 * 1024)
+DOWNLOAD_WORKERS = config.get("download_workers", 4)
 VECTOR_STORE = config.get("vector_store", "FAISS")
+INDEX_DIR = config.get("index_dir", "faiss.index")
+INDEX_KEEP_VERSIONS = config.get("index_keep_versions", 3)
+INDEX_RELOAD_INTERVAL = config.get("index_reload_interval", 30)
+VECTOR_STORAGE = config.get("vector_storage", "float32")
+RERANK_FACTOR = config.get("rerank_factor", 4)
+# "none", or "fiscal_period": one FAISS sub-index per fiscal period, searched by the periods
+# a question names
+INDEX_PARTITIONING = config.get("index_partitioning", "none")
+# "in_process": each worker loads its own index; "shared": workers mmap one exported copy
+SERVING_MODE = config.get("serving_mode", "in_process")
+AZURE_UPLOAD_BATCH_SIZE = config.get("azure_upload_batch_size", 500)
+AZURE_UPLOAD_WORKERS = config.get("azure_upload_workers", 4)
 RETRIEVAL_METHOD = config.get("retrieval_method", "with_neighbors")
+# "flat" chunks, or "parent_child" (embed small children, answer with their parent spans;
+# pair with retrieval_method "parent_child")
+CHUNKING = config.get("chunking", "flat")
+PARENT_CHUNK_SIZE = config.get("parent_chunk_size", 4000)
+CHILD_CHUNK_SIZE = config.get("child_chunk_size", 400)
+CHILD_CHUNK_OVERLAP = config.get("child_chunk_overlap", 50)
 # Secrets
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -0,0 +1,93 @@
+import logging
+import random
+import time
+from typing import List, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = {409, 422, 429, 500, 502, 503, 504}
+
+
+class AzureSearchRestClient:
+    """Minimal Azure AI Search REST client for bulk indexing and filter queries.
+
+    Throttling (429/503), transient server errors and connection failures are retried with
+    exponential backoff and jitter, honouring ``Retry-After`` when the service sends it.
+    Documents that fail individually in a 207 multi-status response are retried on their own.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        api_key: str,
+        index_name: str,
+        key_field: str = "id",
+        api_version: str = "2023-11-01",
+        timeout: float = 30.0,
+        max_retries: int = 5,
+        backoff: float = 0.5,
+        session: Optional[requests.Session] = None,
+    ):
+        self.base_url = f"{endpoint.rstrip('/')}/indexes/{index_name}/docs"
+        self.key_field = key_field
+        self.api_version = api_version
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.session = session or requests.Session()
+        self.session.headers.update({"api-key": api_key, "Content-Type": "application/json"})
+
+    def _sleep(self, attempt: int, retry_after: Optional[str] = None):
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = self.backoff * 2**attempt * (1 + random.random())
+        time.sleep(delay)
+
+    def _post(self, path: str, body: dict) -> dict:
+        url = f"{self.base_url}/{path}"
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.post(
+                    url, params={"api-version": self.api_version}, json=body, timeout=self.timeout
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning(f"Azure Search request failed ({e}), retrying.")
+                self._sleep(attempt)
+                continue
+
+            if response.status_code in RETRYABLE_STATUS and attempt < self.max_retries:
+                logger.warning(f"Azure Search returned {response.status_code}, retrying.")
+                self._sleep(attempt, response.headers.get("Retry-After"))
+                continue
+            response.raise_for_status()
+            return response.json()
+
+    def index_documents(self, documents: List[dict], action: str = "mergeOrUpload"):
+        """Index one batch of documents, retrying only the ones that failed."""
+        pending = [{"@search.action": action, **doc} for doc in documents]
+        for attempt in range(self.max_retries + 1):
+            results = self._post("index", {"value": pending}).get("value", [])
+            failed_keys = {
+                r["key"]
+                for r in results
+                if not r.get("status") and r.get("statusCode") in RETRYABLE_STATUS
+            }
+            errors = [
+                r for r in results if not r.get("status") and r["key"] not in failed_keys
+            ]
+            if errors:
+                raise RuntimeError(f"Azure Search rejected documents: {errors[:3]}")
+            if not failed_keys:
+                return
+            if attempt == self.max_retries:
+                raise RuntimeError(f"{len(failed_keys)} documents still failing after retries.")
+            pending = [doc for doc in pending if doc[self.key_field] in failed_keys]
+            self._sleep(attempt)
+
+    def search(self, body: dict) -> List[dict]:
+        return self._post("search", body).get("value", [])
@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Optional, Union
 
 from langchain.schema import Document
 from pydantic import BaseModel, field_validator, model_serializer
@@ -25,6 +25,12 @@ class ChunkMetadata(BaseModel):
     num_pages: int
     """The number of pages in the document."""
 
+    parent_id: Optional[str] = None
+    """Id of the larger parent span a child chunk belongs to, if parent-child chunking is used."""
+
+    fiscal_period: Optional[str] = None
+    """Fiscal period the document covers, e.g. 'FY2025-Q2', if it could be determined."""
+
     @classmethod
     @field_validator("source_doc")
     def validate_source_doc(cls, value) -> str:
@@ -8,7 +8,7 @@ import tempfile
 import traceback
 import zipfile
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Union
 
 import faiss
 import numpy as np
@@ -16,8 +16,15 @@ from langchain_core.documents import Document
 from pathvalidate import sanitize_filename
 
 from data_ingestion.chunks_schema import Chunk, ChunkMetadata
-from data_ingestion.document_chunker import DocSplitter  # Adjust import as needed
-from data_ingestion.loaders import EnhancedPDFLoader
+from data_ingestion.document_chunker import (  # Adjust import as needed
+    DocSplitter,
+    ParentChildSplitter,
+)
+from data_ingestion.fiscal_periods import extract_fiscal_period
+from data_ingestion.index_versions import IndexVersionStore
+from data_ingestion.ingestion_journal import IngestionJournal
+from data_ingestion.loaders import ConversionCache, EnhancedPDFLoader
+from data_ingestion.shared_index import SHARED_DIR, export_shared_index
 from data_ingestion.vector_handlers import VectorStoreInterface
 
 # initialize logging
@@ -34,13 +41,18 @@ class DocsLoader:
 
     def __init__(
         self,
-        text_splitter: DocSplitter,
+        text_splitter: Union[DocSplitter, ParentChildSplitter],
         vector_store: VectorStoreInterface,
         embedding_model="text-embedding-3-small",
+        conversion_cache_dir: Optional[str] = None,
     ):
         self.text_splitter = text_splitter
         self.embedding_model = embedding_model
         self.vector_store = vector_store
+        self.parents = []
+        self.conversion_cache = (
+            ConversionCache(conversion_cache_dir) if conversion_cache_dir else None
+        )
 
         self.all_metadata = [
             "source_doc",
@@ -48,12 +60,18 @@ class DocsLoader:
             "doc_hash",
             "source_sanitized",
             "num_pages",
+            "fiscal_period",
         ]
 
         self.extenstions_loaders = {
             "pdf": (
                 EnhancedPDFLoader,
-                {"convert_to_md": True, "extract_images": True},
+                # Images aren't consumed downstream, so don't extract them
+                {
+                    "convert_to_md": True,
+                    "extract_images": False,
+                    "cache": self.conversion_cache,
+                },
             ),
         }
 
@@ -61,8 +79,8 @@ class DocsLoader:
         """Sanitize filename using pathvalidate library to ensure cross-platform compatibility."""
         return sanitize_filename(os.path.basename(filename))
 
-    def _load_zip_files(self, zip_path: str):
-        """Load documents from zip file."""
+    def _load_zip_files(self, zip_path: str, journal: Optional[IngestionJournal] = None):
+        """Load documents from zip file, skipping (and recording) those checkpointed in `journal`."""
         docs = []
         project_dir = os.getcwd()
         tmp_extract_dir = os.path.join(project_dir, "tmp_files")
@@ -83,57 +101,95 @@ class DocsLoader:
                 with archive.open(file_info) as file:
                     logger.info(f"Processing {file_info.filename}")
                     try:
-                        loader_class, loader_kwargs = self.extenstions_loaders[
-                            file_extension
-                        ]
-                        file_content = file.read()
-
-                        # Create temporary file with original extension
-                        with tempfile.NamedTemporaryFile(
-                            suffix=file_extension, delete=False, dir=tmp_extract_dir
-                        ) as temp_file:
-                            temp_file_path = temp_file.name
-                            temp_file.write(file_content)
-
-                        try:
-                            loader = loader_class(temp_file_path, **loader_kwargs)
-                            doc = loader.load()
-                            doc[0].metadata["source_path"] = file_info.filename
-                            doc[0].metadata["source_doc"] = Path(
-                                file_info.filename
-                            ).name
-                            doc[0].metadata["source_sanitized"] = (
-                                self._sanitize_filename(file_info.filename)
-                            )
-
-                            doc[0].metadata["doc_hash"] = hashlib.sha256(
-                                file_content
-                            ).hexdigest()
-                            docs.append(doc[0])
-                        finally:
-                            # Clean up temporary file
-                            Path(temp_file_path).unlink()
+                        doc = self._load_file(
+                            file_info.filename, file.read(), tmp_extract_dir, journal
+                        )
+                        docs.append(doc)
                     except Exception as e:
                         logger.warning(f"Failed to load {file_info.filename}: {e}")
                         logger.warning(traceback.format_exc())
                         continue
         return docs
 
+    def _load_file(
+        self,
+        filename: str,
+        file_content: bytes,
+        tmp_extract_dir: str,
+        journal: Optional[IngestionJournal] = None,
+    ) -> Document:
+        """Convert one archive member, or return its checkpointed copy from `journal`."""
+        file_extension = filename.split(".")[-1]
+        loader_class, loader_kwargs = self.extenstions_loaders[file_extension]
+        doc_hash = hashlib.sha256(file_content).hexdigest()
+
+        if journal is not None:
+            done = journal.completed_document(filename, doc_hash)
+            if done is not None:
+                return done
+
+        # Create temporary file with original extension
+        with tempfile.NamedTemporaryFile(
+            suffix=file_extension, delete=False, dir=tmp_extract_dir
+        ) as temp_file:
+            temp_file_path = temp_file.name
+            temp_file.write(file_content)
+
+        try:
+            loader = loader_class(temp_file_path, doc_hash=doc_hash, **loader_kwargs)
+            doc = loader.load()[0]
+            doc.metadata["source_path"] = filename
+            doc.metadata["source_doc"] = Path(filename).name
+            doc.metadata["source_sanitized"] = self._sanitize_filename(filename)
+            doc.metadata["doc_hash"] = doc_hash
+            doc.metadata["fiscal_period"] = extract_fiscal_period(filename, doc.page_content)
+            if journal is not None:
+                journal.record_document(doc)
+            return doc
+        finally:
+            # Clean up temporary file
+            Path(temp_file_path).unlink()
+
+    def _split_doc(self, doc) -> List[tuple]:
+        """Split a document into (chunk text, parent id) pairs.
+
+        With a `ParentChildSplitter` the parent spans are collected in `self.parents`.
+        """
+        if not isinstance(self.text_splitter, ParentChildSplitter):
+            return [(chunk, None) for chunk in self.text_splitter.split_text(doc.page_content)]
+
+        pieces = []
+        doc_metadata = {k: doc.metadata.get(k) for k in self.all_metadata}
+        for parent_idx, (parent, children) in enumerate(
+            self.text_splitter.split_parent_child(doc.page_content)
+        ):
+            parent_id = f"{doc.metadata['source_sanitized']}/p{parent_idx}"
+            self.parents.append(
+                Chunk(
+                    page_content=parent,
+                    metadata=ChunkMetadata(source_chunk=parent_id, **doc_metadata),
+                )
+            )
+            pieces.extend((child, parent_id) for child in children)
+        return pieces
+
     def _chunk_docs(self, docs):
         """Chunk documents."""
         all_chunks = []
+        self.parents = []
 
         for doc in docs:
             try:
                 logger.info(f"Processing {doc.metadata.get('source_file', 'unknown')}")
 
-                chunks = self.text_splitter.split_text(doc.page_content)
+                chunks = self._split_doc(doc)
 
                 print("doc.metadata", doc.metadata)
-                for idx, chunk in enumerate(chunks):
+                for idx, (chunk, parent_id) in enumerate(chunks):
                     chunk_id = f"{doc.metadata['source_sanitized']}/{idx}"
                     metadata = {
                         "source_chunk": chunk_id,
+                        "parent_id": parent_id,
                         **{k: doc.metadata.get(k) for k in self.all_metadata},
                     }
 
@@ -157,14 +213,94 @@ class DocsLoader:
         zip_path: str,
         index_path: str = "faiss.index",
         meta_path: str = "meta.pkl",
+        keep_versions: int = 3,
+        export_shared: bool = False,
+        journal_dir: Optional[str] = None,
+        resume: bool = False,
+        embed_batch_size: int = 256,
     ):
+        """Build the index into a new version under `index_path` and publish it atomically.
+
+        With `export_shared` the version also gets a memory-mappable copy for shared serving.
+        With `journal_dir`, converted documents and embedded batches are checkpointed there;
+        `resume` continues from those checkpoints. The journal is removed once the index is
+        published. Stores that don't save locally (Azure) are not versioned; None is returned.
+        """
         self.chunks = []
 
-        self.docs = self._load_zip_files(zip_path)
+        journal = None
+        if journal_dir:
+            journal = IngestionJournal(journal_dir, self._journal_fingerprint(zip_path))
+            journal.open(resume=resume)
+
+        self.docs = self._load_zip_files(zip_path, journal)
         print("metadata", self.docs[0].metadata)
         self.chunks = self._chunk_docs(self.docs)
-        self.vector_store.add_documents(self.chunks)
-        self.vector_store.save(index_path)
+        if journal is not None:
+            vectors = self._embed_with_journal(journal, embed_batch_size)
+            self.vector_store.add_embeddings(self.chunks, vectors)
+        else:
+            self.vector_store.add_documents(self.chunks)
+        if self.parents:
+            self.vector_store.add_parent_documents(self.parents)
+
+        if not self.vector_store.saves_locally:
+            # Nothing to version for a hosted store; its documents are already live
+            if journal is not None:
+                journal.clear()
+            return None
+
+        versions = IndexVersionStore(index_path, keep=keep_versions)
+        version_dir = versions.new_version_dir()
+        self.vector_store.save(version_dir)
+        if export_shared:
+            export_shared_index(self.vector_store, os.path.join(version_dir, SHARED_DIR))
+        versions.publish(
+            version_dir,
+            {
+                "zip_path": zip_path,
+                "vector_store": type(self.vector_store).__name__,
+                "num_docs": len(self.docs),
+                "num_chunks": len(self.chunks),
+                "doc_hashes": sorted({d.metadata["doc_hash"] for d in self.docs}),
+            },
+        )
+        if journal is not None:
+            journal.clear()
+        return version_dir
+
+    def _journal_fingerprint(self, zip_path: str) -> dict:
+        """Identify the inputs a journal is valid for: archive content and chunking settings."""
+        digest = hashlib.sha256()
+        with open(zip_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return {
+            "zip_sha256": digest.hexdigest(),
+            "splitter": type(self.text_splitter).__name__,
+            "chunk_settings": self.text_splitter.settings(),
+            "embedding_model": getattr(
+                getattr(self.vector_store, "embedding_model", None), "model", None
+            ),
+        }
+
+    def _embed_with_journal(self, journal: IngestionJournal, batch_size: int):
+        """Embed chunks not yet in `journal` in checkpointed batches; return all vectors in chunk order."""
+        pending = [
+            chunk
+            for chunk in self.chunks
+            if not journal.has_vector(chunk.metadata["source_chunk"])
+        ]
+        logger.info(
+            f"Embedding {len(pending)} of {len(self.chunks)} chunks "
+            f"({len(self.chunks) - len(pending)} restored from journal)"
+        )
+        embedding_model = self.vector_store.embedding_model
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start : start + batch_size]
+            vectors = embedding_model.embed_documents([c.page_content for c in batch])
+            journal.record_vectors([c.metadata["source_chunk"] for c in batch], vectors)
+        return journal.vectors_for([c.metadata["source_chunk"] for c in self.chunks])
 
     def load_from_disk(
         self, index_path: str = "faiss.index", meta_path: str = "meta.pkl"
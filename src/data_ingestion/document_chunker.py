@@ -1,5 +1,6 @@
+import re
 from pathlib import Path
-from typing import List, Union
+from typing import List, Optional, Tuple, Union
 
 from langchain.document_loaders import TextLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
@@ -14,10 +15,104 @@ class DocSplitter:
         chunk_overlap: int = 200,
         separators: List[str] = ["\n\n", "\n", " ", ""],
     ):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = separators
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size, chunk_overlap=chunk_overlap, separators=separators
         )
 
+    def settings(self) -> dict:
+        return {
+            "chunk_size": self.chunk_size,
+            "chunk_overlap": self.chunk_overlap,
+            "separators": self.separators,
+        }
+
     def split_text(self, text: str) -> List[str]:
         """Split text into chunks"""
         return self.text_splitter.split_text(text)
+
+
+class ParentChildSplitter:
+    """Split text into parent spans and the small child chunks embedded for matching.
+
+    Parents break at markdown headings and speaker turns (a bold name at line start, as
+    pymupdf4llm renders transcript speakers). Paragraphs of adjacent turns are packed into a
+    parent up to `parent_chunk_size`; a parent that continues a turn starts with that turn's
+    header line, so the speaker stays attributed. Children never cross a parent boundary.
+    """
+
+    TURN_BOUNDARY = r"\n(?=#{1,6} |\*\*[^*\n]+\*\*)"
+    TURN_HEADER = r"#{1,6} |\*\*[^*\n]+\*\*"
+    # Header lines longer than this are speech on the speaker's line; only the name is repeated
+    MAX_HEADER_CHARS = 100
+
+    def __init__(
+        self,
+        parent_chunk_size: int = 4000,
+        child_chunk_size: int = 400,
+        child_chunk_overlap: int = 50,
+    ):
+        self.parent_chunk_size = parent_chunk_size
+        self.child_splitter = DocSplitter(
+            chunk_size=child_chunk_size, chunk_overlap=child_chunk_overlap
+        )
+
+    def _header(self, turn: str) -> Optional[str]:
+        match = re.match(self.TURN_HEADER, turn)
+        if not match:
+            return None
+        line = turn.split("\n", 1)[0]
+        return line if len(line) <= self.MAX_HEADER_CHARS else match.group(0)
+
+    def _paragraphs(self, turn: str, header: Optional[str]) -> List[str]:
+        """Paragraphs of a turn, split further where one wouldn't fit a parent with its header."""
+        room = self.parent_chunk_size - (len(header) + 2 if header else 0)
+        fallback = RecursiveCharacterTextSplitter(
+            chunk_size=room, chunk_overlap=0, separators=["\n", " ", ""]
+        )
+        paragraphs = []
+        for paragraph in re.split(r"\n\s*\n", turn):
+            paragraph = paragraph.strip()
+            if len(paragraph) > room:
+                paragraphs.extend(fallback.split_text(paragraph))
+            elif paragraph:
+                paragraphs.append(paragraph)
+        return paragraphs
+
+    def split_parents(self, text: str) -> List[str]:
+        """Parent spans of `text`, each at most `parent_chunk_size` characters."""
+        parents = []
+        current = ""
+        for turn in re.split(self.TURN_BOUNDARY, text):
+            header = self._header(turn)
+            for i, paragraph in enumerate(self._paragraphs(turn, header)):
+                separator = "\n\n" if i else "\n"
+                if current and len(current) + len(separator) + len(paragraph) <= self.parent_chunk_size:
+                    current += separator + paragraph
+                    continue
+                if current:
+                    parents.append(current)
+                current = f"{header}\n\n{paragraph}" if i and header else paragraph
+        if current:
+            parents.append(current)
+        return parents
+
+    def settings(self) -> dict:
+        return {
+            "parent_chunk_size": self.parent_chunk_size,
+            "turn_boundary": self.TURN_BOUNDARY,
+            "child": self.child_splitter.settings(),
+        }
+
+    def split_parent_child(self, text: str) -> List[Tuple[str, List[str]]]:
+        """Return (parent text, child chunks) pairs in document order."""
+        return [
+            (parent, self.child_splitter.split_text(parent))
+            for parent in self.split_parents(text)
+        ]
+
+    def split_text(self, text: str) -> List[str]:
+        """Child chunks only, for callers that don't track parents."""
+        return [child for _, children in self.split_parent_child(text) for child in children]
@@ -1,8 +1,12 @@
 # Download data
 
+import hashlib
+import json
 import logging
 import os
 import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional, Tuple
 
 import requests
 
@@ -12,24 +16,239 @@ logging.basicConfig(
     format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
-def download_zip_if_needed(url: str, save_path: str = "data/transcripts.zip") -> str:
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_TIMEOUT = (10, 60)  # (connect, read) seconds
+STREAM_CHUNK_SIZE = 1024 * 1024
+# Presigned URLs are often signed for GET only, so HEAD is refused rather than answered
+HEAD_REJECTED_STATUS = {403, 405, 501}
+
+
+class DownloadVerificationError(Exception):
+    """Raised when a downloaded file does not match its expected checksum or is not a valid zip."""
+
+
+def is_valid_zip(path: str) -> bool:
+    """Check that `path` is a readable zip archive whose members all pass their CRC check."""
+    try:
+        with zipfile.ZipFile(path, "r") as archive:
+            return archive.testzip() is None
+    except (zipfile.BadZipFile, OSError, EOFError):
+        return False
+
+
+def _file_digest(path: str, algorithm: str) -> str:
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(STREAM_CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _etag_md5(etag: Optional[str]) -> Optional[str]:
+    """Return the MD5 carried by a strong single-part ETag (S3 style), if any.
+
+    Multipart uploads (``"<md5>-<parts>"``) and weak validators don't describe the body hash.
+    """
+    if not etag or etag.startswith("W/"):
+        return None
+    value = etag.strip('"')
+    if len(value) == 32 and all(c in "0123456789abcdef" for c in value.lower()):
+        return value.lower()
+    return None
+
+
+def _verify(path: str, etag: Optional[str], sha256: Optional[str]):
+    if sha256 and _file_digest(path, "sha256") != sha256.lower():
+        raise DownloadVerificationError(f"SHA-256 mismatch for {path}")
+    expected_md5 = _etag_md5(etag)
+    if expected_md5 and _file_digest(path, "md5") != expected_md5:
+        raise DownloadVerificationError(f"ETag (MD5) mismatch for {path}")
+    if not is_valid_zip(path):
+        raise DownloadVerificationError(f"{path} is not a valid zip archive")
+
+
+def _probe(url: str, timeout) -> Tuple[Optional[int], Optional[str], bool]:
+    """Return (content length, ETag, range support) reported by the server.
+
+    A server that refuses HEAD reports nothing, so the caller falls back to a single stream.
+    """
+    with requests.head(url, allow_redirects=True, timeout=timeout) as r:
+        if r.status_code in HEAD_REJECTED_STATUS:
+            logger.info(f"Server rejected HEAD request (status {r.status_code}).")
+            return None, None, False
+        r.raise_for_status()
+        length = r.headers.get("Content-Length")
+        accepts_ranges = r.headers.get("Accept-Ranges", "").lower() == "bytes"
+        return (int(length) if length else None), r.headers.get("ETag"), accepts_ranges
+
+
+def _split_parts(total_size: int, part_size: int) -> List[Tuple[int, int]]:
+    return [
+        (start, min(start + part_size, total_size) - 1)
+        for start in range(0, total_size, part_size)
+    ]
+
+
+def _load_state(state_path: str) -> dict:
+    try:
+        with open(state_path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(state_path: str, state: dict):
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_path)
+
+
+def _download_range(url, part_path, start, end, etag, timeout):
+    headers = {"Range": f"bytes={start}-{end}"}
+    if etag:
+        # Fail instead of silently mixing bytes from two versions of the file
+        headers["If-Range"] = etag
+    with requests.get(url, headers=headers, stream=True, timeout=timeout) as r:
+        r.raise_for_status()
+        if r.status_code != 206:
+            raise requests.RequestException(
+                f"Server ignored range request for bytes {start}-{end} (status {r.status_code})"
+            )
+        with open(part_path, "r+b") as f:
+            f.seek(start)
+            written = 0
+            for chunk in r.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                if chunk:
+                    f.write(chunk)
+                    written += len(chunk)
+    if written != end - start + 1:
+        raise requests.RequestException(
+            f"Short read for bytes {start}-{end}: got {written} bytes"
+        )
+
+
+def _download_parallel(url, part_path, total_size, etag, part_size, max_workers, timeout):
+    state_path = part_path + ".json"
+    state = _load_state(state_path)
+    resumable = (
+        os.path.isfile(part_path)
+        and state.get("etag") == etag
+        and state.get("size") == total_size
+        and state.get("part_size") == part_size
+    )
+    if not resumable:
+        state = {"etag": etag, "size": total_size, "part_size": part_size, "done": []}
+        with open(part_path, "wb") as f:
+            f.truncate(total_size)
+        _save_state(state_path, state)
+
+    done = set(state["done"])
+    pending = [
+        (i, start, end)
+        for i, (start, end) in enumerate(_split_parts(total_size, part_size))
+        if i not in done
+    ]
+    if resumable:
+        logger.info(f"Resuming download: {len(done)} parts present, {len(pending)} remaining.")
+
+    error = None
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_download_range, url, part_path, start, end, etag, timeout): index
+            for index, start, end in pending
+        }
+        # Record each part as it completes, in any order, so an interrupted run resumes from
+        # everything that made it to disk
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            try:
+                future.result()
+            except requests.RequestException as e:
+                if error is None:
+                    error = e
+                    # Parts already in flight still finish and are recorded
+                    for other in futures:
+                        other.cancel()
+                continue
+            done.add(futures[future])
+            state["done"] = sorted(done)
+            _save_state(state_path, state)
+    if error is not None:
+        raise error
+
+
+def _download_stream(url, part_path, timeout):
+    with requests.get(url, stream=True, timeout=timeout) as r:
+        r.raise_for_status()
+        with open(part_path, "wb") as f:
+            for chunk in r.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                if chunk:
+                    f.write(chunk)
+        return r.headers.get("ETag")
+
+
+def _verify_and_publish(part_path: str, save_path: str, etag: Optional[str], sha256: Optional[str]):
+    """Verify a finished ``.part`` file and rename it into place, dropping the resume state."""
+    state_path = part_path + ".json"
+    try:
+        _verify(part_path, etag, sha256)
+    except DownloadVerificationError:
+        # Corrupt data can't be resumed from, next attempt starts clean
+        for path in (part_path, state_path):
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+
+    os.replace(part_path, save_path)
+    if os.path.exists(state_path):
+        os.remove(state_path)
+
+
+def download_zip_if_needed(
+    url: str,
+    save_path: str = "data/transcripts.zip",
+    part_size: int = DEFAULT_PART_SIZE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    sha256: Optional[str] = None,
+    timeout=DEFAULT_TIMEOUT,
+) -> str:
+    """Download a zip archive to `save_path` unless a valid copy is already there.
+
+    Servers that advertise byte ranges are fetched in `part_size` parts over `max_workers`
+    connections; progress is kept next to the ``.part`` file so an interrupted download resumes
+    where it stopped. The result is checked against `sha256` (if given), the S3-style ETag MD5 and
+    the zip CRCs before being atomically renamed into place.
+    """
     if os.path.isfile(save_path):
-        logger.info(f"Using cached ZIP at: {save_path}")
-        return save_path
+        if is_valid_zip(save_path) and (
+            sha256 is None or _file_digest(save_path, "sha256") == sha256.lower()
+        ):
+            logger.info(f"Using cached ZIP at: {save_path}")
+            return save_path
+        logger.warning(f"Cached ZIP at {save_path} failed verification, downloading again.")
+        os.remove(save_path)
 
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
+    os.makedirs(os.path.dirname(save_path) or ".", exist_ok=True)
+    part_path = save_path + ".part"
     logger.info(f"Fetching ZIP from: {url}")
 
     try:
-        with requests.get(url, stream=True, timeout=15) as r:
-            r.raise_for_status()
-            with open(save_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+        total_size, etag, accepts_ranges = _probe(url, timeout)
+        if accepts_ranges and total_size:
+            _download_parallel(
+                url, part_path, total_size, etag, part_size, max_workers, timeout
+            )
+        else:
+            logger.info("Server does not support range requests; using a single stream.")
+            etag = _download_stream(url, part_path, timeout) or etag
+
+        _verify_and_publish(part_path, save_path, etag, sha256)
         logger.info("Download successful.")
         return save_path
-    except requests.RequestException as e:
+    except (requests.RequestException, DownloadVerificationError) as e:
         logger.error(f"Download failed: {e}")
         raise
 
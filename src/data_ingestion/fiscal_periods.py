@@ -0,0 +1,136 @@
+import re
+from typing import List, Optional, Set, Tuple
+
+# (fiscal year, quarter); quarter is None for a whole-year reference
+PeriodRef = Tuple[int, Optional[int]]
+
+UNKNOWN_PERIOD = "unknown"
+
+_ORDINALS = {"first": 1, "second": 2, "third": 3, "fourth": 4}
+# Not followed by more digits, a decimal or a percent sign ("Q2 25% growth")
+_NOT_AMOUNT = r"(?![\d%]|\.\d|\s*%)"
+_YEAR = rf"(?:'|’)?(\d{{4}}|\d{{2}}){_NOT_AMOUNT}"
+_FISCAL = r"(?:FY|fiscal\s+(?:year\s+)?)"
+_QUARTER = r"(?:Q([1-4])|(first|second|third|fourth)\s+(?:fiscal\s+)?quarter)"
+
+# "Q2 FY25", "Q2'25", "Q2 2025", "second quarter of fiscal 2025", "second quarter 2025".
+# A two-digit year needs FY/fiscal or an apostrophe: "Q3 10 of them churned" is no year
+_QUARTER_YEAR = re.compile(
+    rf"\b{_QUARTER}(?:\s*,?\s*(?:of\s+)?|\s*-\s*)"
+    rf"(?:(?:{_FISCAL}\s*|'|’)(\d{{4}}|\d{{2}})|(\d{{4}})){_NOT_AMOUNT}",
+    re.IGNORECASE,
+)
+# "FY25 Q2", "FY2025 second quarter", "fiscal 2025 Q2"
+_YEAR_QUARTER = re.compile(rf"\b{_FISCAL}\s*{_YEAR}\s*,?\s*(?:-\s*)?{_QUARTER}", re.IGNORECASE)
+_FISCAL_YEAR = re.compile(rf"\b{_FISCAL}\s*{_YEAR}", re.IGNORECASE)
+_BARE_QUARTER = re.compile(rf"\b{_QUARTER}", re.IGNORECASE)
+# Filenames only: "AAPL-2025-Q2", "2025Q2", "2025 second quarter". In running text a bare
+# year before a quarter is too often something else ("in 2024 Q1 was weak")
+_FILENAME_YEAR_QUARTER = re.compile(rf"\b(\d{{4}})\s*-?\s*{_QUARTER}", re.IGNORECASE)
+
+# Transcript titles name the period near the top; don't scan the whole call
+_CONTENT_SCAN_CHARS = 2000
+
+
+def _year(text: str) -> int:
+    year = int(text)
+    return 2000 + year if year < 100 else year
+
+
+def _quarter(number: Optional[str], ordinal: Optional[str]) -> int:
+    return int(number) if number else _ORDINALS[ordinal.lower()]
+
+
+def period_key(ref: PeriodRef) -> str:
+    """Canonical partition name, e.g. ``FY2025-Q2`` or ``FY2025``."""
+    year, quarter = ref
+    return f"FY{year}-Q{quarter}" if quarter else f"FY{year}"
+
+
+def parse_period_key(key: str) -> Optional[PeriodRef]:
+    match = re.fullmatch(r"FY(\d{4})(?:-Q([1-4]))?", key)
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2)) if match.group(2) else None
+
+
+def _located_references(text: str) -> List[Tuple[int, PeriodRef]]:
+    """Period references in `text` with the offset each one is named at."""
+    located = []
+    covered = []
+
+    for match in _QUARTER_YEAR.finditer(text):
+        year = match.group(3) or match.group(4)
+        located.append((match.start(), (_year(year), _quarter(match.group(1), match.group(2)))))
+        covered.append(match.span())
+    for match in _YEAR_QUARTER.finditer(text):
+        if any(start <= match.start() < end for start, end in covered):
+            continue
+        located.append((match.start(), (_year(match.group(1)), _quarter(match.group(2), match.group(3)))))
+        covered.append(match.span())
+
+    def uncovered(match) -> bool:
+        return not any(start <= match.start() < end for start, end in covered)
+
+    years = {_year(m.group(1)) for m in _FISCAL_YEAR.finditer(text)} | {y for _, (y, _) in located}
+    bare_quarters = [m for m in _BARE_QUARTER.finditer(text) if uncovered(m)]
+    if len(years) == 1:
+        year = next(iter(years))
+        located.extend((m.start(), (year, _quarter(m.group(1), m.group(2)))) for m in bare_quarters)
+
+    quarters_by_year = {y for _, (y, q) in located if q}
+    for match in _FISCAL_YEAR.finditer(text):
+        year = _year(match.group(1))
+        if uncovered(match) and year not in quarters_by_year:
+            located.append((match.start(), (year, None)))
+    return located
+
+
+def parse_period_references(text: str) -> Set[PeriodRef]:
+    """Find fiscal periods referenced in `text`.
+
+    Quarters written without a year ("Q1 and Q2 FY25") take the year when exactly one fiscal
+    year is mentioned; otherwise they are ignored. Bare calendar years are ignored too, as
+    they don't map to a fiscal period unambiguously.
+    """
+    return {ref for _, ref in _located_references(text)}
+
+
+def extract_fiscal_period(filename: str, content: str = "") -> Optional[str]:
+    """Return the period key of a transcript, from its filename or else the top of its text.
+
+    The first quarter named wins, so later mentions ("compared with Q4 FY24", "next
+    quarter's Q3 guidance") don't override the title. Filenames may also put a plain year
+    before the quarter ("AAPL-2025-Q2.pdf").
+    """
+    # Filenames use separators like "Q2_FY25"
+    name = re.sub(r"[_.]", " ", filename)
+    name_refs = _located_references(name) + [
+        (m.start(), (_year(m.group(1)), _quarter(m.group(2), m.group(3))))
+        for m in _FILENAME_YEAR_QUARTER.finditer(name)
+    ]
+    lines = content[:_CONTENT_SCAN_CHARS].splitlines()
+    year_only = None
+    for located in [name_refs] + [_located_references(line) for line in lines]:
+        quarters = sorted((start, ref) for start, ref in located if ref[1])
+        if quarters:
+            return period_key(quarters[0][1])
+        if located and year_only is None:
+            year_only = min(ref for _, ref in located)
+    return period_key(year_only) if year_only else None
+
+
+def matching_periods(refs: Set[PeriodRef], keys: List[str]) -> List[str]:
+    """Partition keys covered by `refs`: a year reference matches all of that year's quarters."""
+    matched = []
+    for key in keys:
+        period = parse_period_key(key)
+        if period is None:
+            continue
+        year, quarter = period
+        if any(
+            ref_year == year and (ref_quarter is None or quarter is None or ref_quarter == quarter)
+            for ref_year, ref_quarter in refs
+        ):
+            matched.append(key)
+    return matched
@@ -0,0 +1,193 @@
+import datetime
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CURRENT_POINTER = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+VERSIONS_DIR = "versions"
+
+
+class IndexVersionStore:
+    """Versioned index directories under a single root with an atomically swapped pointer.
+
+    Layout::
+
+        <root>/CURRENT                  # name of the published version
+        <root>/versions/<version>/      # index files + manifest.json
+
+    Builds write into a fresh version directory and only become visible to readers when
+    `publish` replaces the pointer file, so a half-written index is never served.
+    """
+
+    def __init__(self, root: str, keep: int = 3):
+        self.root = root
+        self.keep = keep
+        self.versions_dir = os.path.join(root, VERSIONS_DIR)
+        self.pointer_path = os.path.join(root, CURRENT_POINTER)
+
+    def new_version_dir(self) -> str:
+        # Microseconds keep names in build order when several are created within a second
+        timestamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        version = f"{timestamp}-{uuid.uuid4().hex[:8]}"
+        path = os.path.join(self.versions_dir, version)
+        os.makedirs(path)
+        return path
+
+    def list_versions(self) -> List[str]:
+        """Return published-or-staged version names, oldest first."""
+        if not os.path.isdir(self.versions_dir):
+            return []
+        return sorted(
+            name
+            for name in os.listdir(self.versions_dir)
+            if os.path.isdir(os.path.join(self.versions_dir, name))
+        )
+
+    def current_version(self) -> Optional[str]:
+        try:
+            with open(self.pointer_path, "r") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def current_path(self) -> Optional[str]:
+        """Directory of the published index, or the root itself for a legacy unversioned index."""
+        version = self.current_version()
+        if version:
+            return os.path.join(self.versions_dir, version)
+        if os.path.isfile(os.path.join(self.root, "index.faiss")):
+            return self.root
+        return None
+
+    def read_manifest(self, version: str) -> dict:
+        with open(os.path.join(self.versions_dir, version, MANIFEST_FILE), "r") as f:
+            return json.load(f)
+
+    def publish(self, version_dir: str, manifest: dict):
+        """Write the manifest, point CURRENT at `version_dir` and prune old versions."""
+        version = os.path.basename(os.path.normpath(version_dir))
+        manifest = {
+            "version": version,
+            "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "previous_version": self.current_version(),
+            **manifest,
+        }
+        with open(os.path.join(version_dir, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        self._swap_pointer(version)
+        logger.info(f"Published index version {version}")
+        self._prune()
+
+    def rollback(self, version: Optional[str] = None) -> str:
+        """Point CURRENT back at `version`, or at the version published before the current one."""
+        versions = self.list_versions()
+        if version is None:
+            current = self.current_version()
+            previous = self._previous_version(current) if current else None
+            if previous in versions:
+                self._swap_pointer(previous)
+                logger.info(f"Rolled back index to version {previous}")
+                return previous
+            older = [v for v in versions if current is None or v < current]
+            if not older:
+                raise ValueError("No previous index version to roll back to.")
+            version = older[-1]
+        elif version not in versions:
+            raise ValueError(f"Unknown index version: {version}")
+
+        self._swap_pointer(version)
+        logger.info(f"Rolled back index to version {version}")
+        return version
+
+    def _previous_version(self, version: str) -> Optional[str]:
+        try:
+            return self.read_manifest(version).get("previous_version")
+        except (OSError, ValueError):
+            return None
+
+    def _swap_pointer(self, version: str):
+        tmp_path = f"{self.pointer_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(version)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.pointer_path)
+
+    def _prune(self):
+        current = self.current_version()
+        older = [v for v in self.list_versions() if v != current and (current is None or v < current)]
+        for version in older[: max(len(older) - self.keep, 0)]:
+            shutil.rmtree(os.path.join(self.versions_dir, version), ignore_errors=True)
+            logger.info(f"Removed old index version {version}")
+
+
+class ReloadableVectorStore:
+    """Vector store proxy that swaps to newly published index versions in the background.
+
+    Attribute access resolves against the adapter that is current at call time, so a query
+    that already started finishes on the old index while new queries use the new one.
+    """
+
+    def __init__(
+        self,
+        versions: IndexVersionStore,
+        load_adapter: Callable[[str], object],
+        poll_interval: float = 30.0,
+    ):
+        self._versions = versions
+        self._load_adapter = load_adapter
+        self._poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread = None
+
+        path = versions.current_path()
+        if path is None:
+            raise FileNotFoundError(f"No published index found in {versions.root}")
+        self._current_path = path
+        self._adapter = load_adapter(path)
+
+    @property
+    def current_path(self) -> str:
+        return self._current_path
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._adapter, name)
+
+    def reload_if_changed(self) -> bool:
+        path = self._versions.current_path()
+        if path is None or path == self._current_path:
+            return False
+        adapter = self._load_adapter(path)
+        # Single reference assignment: readers see either the old or the new adapter
+        self._adapter, self._current_path = adapter, path
+        logger.info(f"Switched vector store to {path}")
+        return True
+
+    def _watch(self):
+        while not self._stop.wait(self._poll_interval):
+            try:
+                self.reload_if_changed()
+            except Exception:
+                logger.warning("Failed to load new index version; keeping current one.", exc_info=True)
+
+    def start_watching(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name="index-watcher", daemon=True)
+            self._thread.start()
+
+    def stop_watching(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
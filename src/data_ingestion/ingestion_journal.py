@@ -0,0 +1,148 @@
+import json
+import logging
+import os
+import shutil
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain.schema import Document
+
+logger = logging.getLogger(__name__)
+
+META_FILE = "journal.json"
+DOCUMENTS_FILE = "documents.jsonl"
+VECTORS_FILE = "vectors.f32"
+VECTOR_IDS_FILE = "vector_ids.jsonl"
+
+
+def _read_committed_lines(path: str) -> List[dict]:
+    """Parse complete JSON lines, truncating a torn tail left by a crash mid-write."""
+    records = []
+    valid_bytes = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+            valid_bytes += len(line)
+    with open(path, "ab") as f:
+        f.truncate(valid_bytes)
+    return records
+
+
+def _append_durably(path: str, data: bytes):
+    with open(path, "ab") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class IngestionJournal:
+    """Append-only checkpoint log for `DocsLoader.load_and_embed_zip`.
+
+    Converted documents and embedded chunk vectors are fsynced as they complete, so a run
+    that dies partway (rate limit, network blip) can be resumed without repeating PDF
+    conversion or paid embedding calls. Each vector batch is committed by its line in
+    ``vector_ids.jsonl``, written after the vectors; on reopen, vector bytes past the last
+    committed batch are truncated. The journal is tied to a `fingerprint` of the input and
+    chunking settings and is discarded when they change.
+    """
+
+    def __init__(self, path: str, fingerprint: dict):
+        self.path = path
+        self.fingerprint = fingerprint
+        self._docs: Dict[tuple, Document] = {}
+        self._vector_rows: Dict[str, int] = {}
+        self._dim: Optional[int] = None
+        self._vector_batches: List[np.ndarray] = []
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def open(self, resume: bool = False):
+        """Load existing checkpoints when resuming a matching run, otherwise start empty."""
+        meta = None
+        if resume and os.path.exists(self._file(META_FILE)):
+            with open(self._file(META_FILE), "r") as f:
+                meta = json.load(f)
+            if meta != self.fingerprint:
+                logger.warning("Ingestion journal was written for different inputs; starting over.")
+                meta = None
+        elif resume:
+            logger.info("No ingestion journal found; starting from scratch.")
+
+        if meta is None:
+            self.clear()
+            os.makedirs(self.path)
+            with open(self._file(META_FILE), "w") as f:
+                json.dump(self.fingerprint, f)
+            return
+
+        self._load_documents()
+        self._load_vectors()
+        logger.info(
+            f"Resuming from journal: {len(self._docs)} documents converted, "
+            f"{len(self._vector_rows)} chunks embedded."
+        )
+
+    def _load_documents(self):
+        if not os.path.exists(self._file(DOCUMENTS_FILE)):
+            return
+        for record in _read_committed_lines(self._file(DOCUMENTS_FILE)):
+            doc = Document(page_content=record["page_content"], metadata=record["metadata"])
+            self._docs[(doc.metadata["source_path"], doc.metadata["doc_hash"])] = doc
+
+    def _load_vectors(self):
+        if os.path.exists(self._file(VECTOR_IDS_FILE)):
+            for batch in _read_committed_lines(self._file(VECTOR_IDS_FILE)):
+                self._dim = batch["dim"]
+                for chunk_id in batch["ids"]:
+                    self._vector_rows[chunk_id] = len(self._vector_rows)
+
+        # Also drops the bytes of a first batch that crashed before its ids line was written
+        committed_bytes = len(self._vector_rows) * (self._dim or 0) * 4
+        with open(self._file(VECTORS_FILE), "ab") as f:
+            f.truncate(committed_bytes)
+        if self._dim:
+            self._vector_batches = [
+                np.fromfile(self._file(VECTORS_FILE), dtype="float32").reshape(-1, self._dim)
+            ]
+
+    def completed_document(self, source_path: str, doc_hash: str) -> Optional[Document]:
+        return self._docs.get((source_path, doc_hash))
+
+    def record_document(self, doc: Document):
+        record = {"page_content": doc.page_content, "metadata": doc.metadata}
+        _append_durably(self._file(DOCUMENTS_FILE), json.dumps(record).encode("utf-8") + b"\n")
+        self._docs[(doc.metadata["source_path"], doc.metadata["doc_hash"])] = doc
+
+    def has_vector(self, chunk_id: str) -> bool:
+        return chunk_id in self._vector_rows
+
+    def record_vectors(self, chunk_ids: List[str], vectors: List[List[float]]):
+        batch = np.asarray(vectors, dtype="float32")
+        self._dim = batch.shape[1]
+        _append_durably(self._file(VECTORS_FILE), batch.tobytes())
+        # The ids line commits the batch
+        _append_durably(
+            self._file(VECTOR_IDS_FILE),
+            json.dumps({"ids": chunk_ids, "dim": self._dim}).encode("utf-8") + b"\n",
+        )
+        for chunk_id in chunk_ids:
+            self._vector_rows[chunk_id] = len(self._vector_rows)
+        self._vector_batches.append(batch)
+
+    def vectors_for(self, chunk_ids: List[str]) -> np.ndarray:
+        if len(self._vector_batches) > 1:
+            self._vector_batches = [np.concatenate(self._vector_batches)]
+        return self._vector_batches[0][[self._vector_rows[chunk_id] for chunk_id in chunk_ids]]
+
+    def clear(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+        self._docs = {}
+        self._vector_rows = {}
+        self._dim = None
+        self._vector_batches = []
@@ -1,6 +1,10 @@
+import gzip
+import hashlib
+import json
 import logging
 import os
 import tempfile
+from typing import Optional
 
 import fitz
 import pymupdf4llm
@@ -19,17 +23,84 @@ def get_page_count(file_path):
         return doc.page_count
 
 
+def file_sha256(file_path) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ConversionCache:
+    """On-disk cache of PDF -> markdown conversions.
+
+    Entries are gzip-compressed JSON holding the markdown and page count, keyed by the PDF's
+    SHA-256 together with the converter settings, so re-chunking experiments don't pay for
+    `pymupdf4llm` and pandoc again while a converter upgrade still invalidates old entries.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self._converter_versions = None
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _versions(self) -> dict:
+        if self._converter_versions is None:
+            try:
+                pandoc_version = pypandoc.get_pandoc_version()
+            except OSError:
+                pandoc_version = "unknown"
+            self._converter_versions = {
+                "pymupdf4llm": pymupdf4llm.__version__,
+                "pandoc": pandoc_version,
+            }
+        return self._converter_versions
+
+    def key(self, doc_hash: str, settings: dict) -> str:
+        payload = json.dumps(
+            {"doc_hash": doc_hash, **settings, **self._versions()}, sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json.gz")
+
+    def get(self, key: str) -> Optional[dict]:
+        try:
+            with gzip.open(self._path(key), "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError):
+            logger.warning(f"Ignoring unreadable conversion cache entry {key}")
+            return None
+
+    def put(self, key: str, markdown: str, num_pages: int):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump({"markdown": markdown, "num_pages": num_pages}, f)
+        os.replace(tmp_path, path)
+
+
 class EnhancedPDFLoader(PyMuPDFLoader):
     """Enhanced loader with optional image extraction and markdown conversion."""
 
     def __init__(
-        self, file_path: str, convert_to_md: bool = False, extract_images: bool = False
+        self,
+        file_path: str,
+        convert_to_md: bool = False,
+        extract_images: bool = False,
+        cache: Optional[ConversionCache] = None,
+        doc_hash: Optional[str] = None,
     ):
         file_path = str(file_path)
         super().__init__(file_path)
         self._file_path = file_path
         self._convert_to_md = convert_to_md
         self._extract_images = extract_images
+        self._cache = cache
+        self._doc_hash = doc_hash
 
     def load(self):
         documents = None
@@ -48,19 +119,36 @@ class EnhancedPDFLoader(PyMuPDFLoader):
         return documents
 
     def _convert_pdf_to_markdown(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            media_dir = os.path.join(tmpdir, "media")
-            gfm = pymupdf4llm.to_markdown(
-                self._file_path,
-                write_images=self._extract_images,
-                image_path=media_dir,
-            )
-            markdown = pypandoc.convert_text(gfm, "markdown", format="gfm")
-            doc = Document(page_content=markdown)
-            doc.metadata.update(
-                {
-                    "converted_to": "markdown",
-                    "num_pages": get_page_count(self._file_path),
-                }
+        cache_key = None
+        if self._cache is not None:
+            doc_hash = self._doc_hash or file_sha256(self._file_path)
+            cache_key = self._cache.key(
+                doc_hash,
+                {"format": "markdown", "extract_images": self._extract_images},
             )
-            return [doc]
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                logger.info("Using cached markdown conversion.")
+                return [self._markdown_document(cached["markdown"], cached["num_pages"])]
+
+        if self._extract_images:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                gfm = pymupdf4llm.to_markdown(
+                    self._file_path,
+                    write_images=True,
+                    image_path=os.path.join(tmpdir, "media"),
+                )
+        else:
+            gfm = pymupdf4llm.to_markdown(self._file_path, ignore_images=True)
+        markdown = pypandoc.convert_text(gfm, "markdown", format="gfm")
+        num_pages = get_page_count(self._file_path)
+
+        if cache_key is not None:
+            self._cache.put(cache_key, markdown, num_pages)
+        return [self._markdown_document(markdown, num_pages)]
+
+    @staticmethod
+    def _markdown_document(markdown: str, num_pages: int) -> Document:
+        doc = Document(page_content=markdown)
+        doc.metadata.update({"converted_to": "markdown", "num_pages": num_pages})
+        return doc
@@ -0,0 +1,233 @@
+import json
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain.embeddings import OpenAIEmbeddings
+from langchain.schema import Document
+
+from data_ingestion.fiscal_periods import (
+    UNKNOWN_PERIOD,
+    matching_periods,
+    parse_period_references,
+)
+from data_ingestion.vector_handlers import (
+    FAISSAdapter,
+    VectorStorage,
+    VectorStoreInterface,
+    select_parents,
+)
+
+logger = logging.getLogger(__name__)
+
+PARTITIONS_FILE = "partitions.json"
+PARTITIONS_DIR = "partitions"
+
+
+def _partition_of(doc: Document) -> str:
+    return doc.metadata.get("fiscal_period") or UNKNOWN_PERIOD
+
+
+class PartitionedFAISSAdapter(VectorStoreInterface):
+    """FAISS store split into one `FAISSAdapter` per fiscal period.
+
+    Queries that name a period ("Q2 FY25", "fiscal 2024") search only the matching
+    partitions, plus chunks whose period couldn't be determined at ingestion. Queries without
+    a recognised period, or naming a period that isn't indexed, search every partition. The
+    query is embedded once and per-partition hits are merged by distance.
+    """
+
+    def __init__(
+        self,
+        embedding_model=None,
+        model_name: str = "text-embedding-ada-002",
+        storage: VectorStorage = "float32",
+        rerank_factor: int = 4,
+    ):
+        # One embedding model shared by every partition
+        self.embedding_model = embedding_model or OpenAIEmbeddings(model=model_name)
+        self.storage = storage
+        self.rerank_factor = rerank_factor
+        self.partitions: Dict[str, FAISSAdapter] = {}
+
+    @staticmethod
+    def is_partitioned(path: str) -> bool:
+        return os.path.exists(os.path.join(path, PARTITIONS_FILE))
+
+    def _new_partition(self) -> FAISSAdapter:
+        return FAISSAdapter(
+            embedding_model=self.embedding_model,
+            storage=self.storage,
+            rerank_factor=self.rerank_factor,
+        )
+
+    def _group(self, docs: List[Document], embeddings=None) -> Dict[str, tuple]:
+        grouped = {}
+        for i, doc in enumerate(docs):
+            docs_i, rows = grouped.setdefault(_partition_of(doc), ([], []))
+            docs_i.append(doc)
+            rows.append(i)
+        return {
+            key: (docs_i, None if embeddings is None else [embeddings[i] for i in rows])
+            for key, (docs_i, rows) in grouped.items()
+        }
+
+    def add_documents(self, docs: List[Document]):
+        for key, (partition_docs, _) in self._group(docs).items():
+            self.partitions.setdefault(key, self._new_partition()).add_documents(partition_docs)
+
+    def add_embeddings(self, docs: List[Document], embeddings):
+        for key, (partition_docs, vectors) in self._group(docs, embeddings).items():
+            self.partitions.setdefault(key, self._new_partition()).add_embeddings(
+                partition_docs, vectors
+            )
+
+    def add_parent_documents(self, parents: List[Document]):
+        for key, (partition_parents, _) in self._group(parents).items():
+            self.partitions.setdefault(key, self._new_partition()).add_parent_documents(
+                partition_parents
+            )
+
+    def save(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        manifest = {}
+        for key, partition in self.partitions.items():
+            partition.save(os.path.join(path, PARTITIONS_DIR, key))
+            manifest[key] = {
+                "chunks": partition.index.index.ntotal if partition.index else 0
+            }
+        with open(os.path.join(path, PARTITIONS_FILE), "w") as f:
+            json.dump({"storage": self.storage, "partitions": manifest}, f)
+
+    def load(self, path: str):
+        with open(os.path.join(path, PARTITIONS_FILE), "r") as f:
+            manifest = json.load(f)
+        self.partitions = {}
+        for key, info in manifest["partitions"].items():
+            partition = self._new_partition()
+            if info["chunks"]:
+                partition.load(os.path.join(path, PARTITIONS_DIR, key))
+            self.partitions[key] = partition
+
+    def _check_loaded(self):
+        if not self.partitions:
+            raise ValueError(
+                "No index available. Please add documents first or load an existing index."
+            )
+
+    def select_partitions(self, query: str) -> List[str]:
+        """Partition keys a query should search, falling back to all of them."""
+        searchable = [key for key, p in self.partitions.items() if p.index is not None]
+        refs = parse_period_references(query)
+        matched = matching_periods(refs, searchable) if refs else []
+        if not matched:
+            return searchable
+        logger.debug(f"Query names {sorted(refs)}; searching partitions {matched}")
+        if UNKNOWN_PERIOD in searchable:
+            matched.append(UNKNOWN_PERIOD)
+        return matched
+
+    def _hits(self, queries: List[str], k: int) -> List[List[Tuple[Document, float]]]:
+        """Global top-k per query over its selected partitions, with one embedding request."""
+        self._check_loaded()
+        if len(queries) == 1:
+            embeddings = [self.embedding_model.embed_query(queries[0])]
+        else:
+            embeddings = self.embedding_model.embed_documents(queries)
+        embeddings = np.asarray(embeddings, dtype="float32")
+
+        # Search each partition once for all the queries that selected it
+        queries_by_partition = {}
+        for row, query in enumerate(queries):
+            for key in self.select_partitions(query):
+                queries_by_partition.setdefault(key, []).append(row)
+
+        hits = [[] for _ in queries]
+        for key, rows in queries_by_partition.items():
+            partition_hits = self.partitions[key]._search_embeddings(embeddings[rows], k)
+            for row, row_hits in zip(rows, partition_hits):
+                hits[row].extend(row_hits)
+        return [sorted(row_hits, key=lambda hit: hit[1])[:k] for row_hits in hits]
+
+    def _chunk_groups(self, hits: List[List[Tuple[Document, float]]]) -> dict:
+        """Neighbor lookup over the partitions the hits came from (a document never spans two)."""
+        keys = {_partition_of(doc) for row in hits for doc, _ in row}
+        grouped = {}
+        for key in keys:
+            grouped.update(self.partitions[key]._chunk_groups())
+        return grouped
+
+    def _parents(self, hits: List[List[Tuple[Document, float]]]) -> dict:
+        parents = {}
+        for key in {_partition_of(doc) for row in hits for doc, _ in row}:
+            parents.update(self.partitions[key].parents)
+        return parents
+
+    def similarity_search(self, query: str, k: int = 4) -> List[Document]:
+        return [doc for doc, _ in self._hits([query], k)[0]]
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4
+    ) -> List[Tuple[Document, float]]:
+        return self._hits([query], k)[0]
+
+    def similarity_search_with_neighbors(
+        self, query: str, k: int = 4, window: int = 1
+    ) -> List[Document]:
+        hits = self._hits([query], k)
+        return FAISSAdapter._expand_neighbors(hits[0], self._chunk_groups(hits), window)
+
+    def similarity_search_with_parents(
+        self, query: str, k: int = 4, fetch_k: Optional[int] = None
+    ) -> List[Document]:
+        hits = self._hits([query], fetch_k or 4 * k)
+        return select_parents(hits[0], self._parents(hits), k)
+
+    def batch_similarity_search(
+        self, queries: List[str], k: int = 4
+    ) -> List[List[Document]]:
+        return [[doc for doc, _ in row] for row in self._hits(queries, k)]
+
+    def batch_similarity_search_with_neighbors(
+        self, queries: List[str], k: int = 4, window: int = 1
+    ) -> List[List[Document]]:
+        hits = self._hits(queries, k)
+        grouped = self._chunk_groups(hits)
+        return [FAISSAdapter._expand_neighbors(row, grouped, window) for row in hits]
+
+    def batch_similarity_search_with_parents(
+        self, queries: List[str], k: int = 4, fetch_k: Optional[int] = None
+    ) -> List[List[Document]]:
+        hits = self._hits(queries, fetch_k or 4 * k)
+        parents = self._parents(hits)
+        return [select_parents(row, parents, k) for row in hits]
+
+    def as_retriever(self, search_type: str = "similarity", **kwargs):
+        raise NotImplementedError(
+            "Retriever interface is not available for the partitioned index."
+        )
+
+    def get_unique_documents_metadata(self) -> List[dict]:
+        self._check_loaded()
+        documents_info = []
+        for partition in self.partitions.values():
+            if partition.index is not None:
+                documents_info.extend(partition.get_unique_documents_metadata())
+        return documents_info
+
+
+def load_faiss_store(
+    path: str, embedding_model, rerank_factor: int = 4
+) -> VectorStoreInterface:
+    """Load an index version written by either `FAISSAdapter` or `PartitionedFAISSAdapter`."""
+    if PartitionedFAISSAdapter.is_partitioned(path):
+        vector_store = PartitionedFAISSAdapter(
+            embedding_model=embedding_model, rerank_factor=rerank_factor
+        )
+    else:
+        vector_store = FAISSAdapter(
+            embedding_model=embedding_model, rerank_factor=rerank_factor
+        )
+    vector_store.load(path)
+    return vector_store
@@ -0,0 +1,251 @@
+import json
+import logging
+import mmap
+import os
+from typing import List, Optional, Tuple
+
+import faiss
+import numpy as np
+from langchain.schema import Document
+
+from data_ingestion.vector_handlers import (
+    FAISSAdapter,
+    VectorStoreInterface,
+    select_parents,
+)
+
+logger = logging.getLogger(__name__)
+
+SHARED_DIR = "shared"
+HEADER_FILE = "shared.json"
+VECTORS_FILE = "vectors.f32"
+CHUNKS_FILE = "chunks.jsonl"
+PARENTS_FILE = "parents.jsonl"
+DOCUMENTS_FILE = "documents.json"
+
+
+def _write_records(path: str, records: List[dict]):
+    """Write JSON records one per line plus a ``.offsets`` table for O(1) random access."""
+    offsets = np.zeros(len(records) + 1, dtype="uint64")
+    with open(path, "wb") as f:
+        for row, record in enumerate(records):
+            line = json.dumps(record).encode("utf-8") + b"\n"
+            f.write(line)
+            offsets[row + 1] = offsets[row] + len(line)
+    offsets.tofile(f"{path}.offsets")
+
+
+class _MappedRecords:
+    """Read-only, memory-mapped view over a file written by `_write_records`."""
+
+    def __init__(self, path: str):
+        self._offsets = np.memmap(f"{path}.offsets", dtype="uint64", mode="r")
+        with open(path, "rb") as f:
+            # mmap can't map an empty file
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if len(self) else b""
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, row: int) -> dict:
+        return json.loads(self._data[int(self._offsets[row]) : int(self._offsets[row + 1])])
+
+
+def _chunk_key(doc: Document) -> Tuple[str, int]:
+    chunk_ref = doc.metadata.get("source_chunk") or ""
+    src, _, idx_str = chunk_ref.rpartition("/")
+    try:
+        return src, int(idx_str)
+    except ValueError:
+        return chunk_ref, -1
+
+
+def export_shared_index(adapter: FAISSAdapter, path: str):
+    """Write `adapter`'s vectors and chunks as flat read-only files for `SharedFAISSAdapter`.
+
+    Rows are ordered by (source, chunk index) so the neighbors of a hit are the adjacent rows
+    and need no lookup table. Parent spans, if any, go to a second record file.
+    """
+    index = adapter.index
+    if adapter._vectors is not None:
+        vectors = np.asarray(adapter._vectors)
+    else:
+        vectors = index.index.reconstruct_n(0, index.index.ntotal)
+    docs = [index.docstore.search(index.index_to_docstore_id[i]) for i in range(len(vectors))]
+    order = sorted(range(len(docs)), key=lambda i: _chunk_key(docs[i]))
+
+    os.makedirs(path, exist_ok=True)
+    np.ascontiguousarray(vectors[order], dtype="float32").tofile(os.path.join(path, VECTORS_FILE))
+
+    parent_ids = sorted(adapter.parents)
+    parent_rows = {parent_id: row for row, parent_id in enumerate(parent_ids)}
+    _write_records(
+        os.path.join(path, PARENTS_FILE),
+        [
+            {
+                "page_content": adapter.parents[parent_id].page_content,
+                "metadata": adapter.parents[parent_id].metadata,
+            }
+            for parent_id in parent_ids
+        ],
+    )
+    # Children carry their parent's row, so the child -> parent lookup needs no map in memory
+    _write_records(
+        os.path.join(path, CHUNKS_FILE),
+        [
+            {
+                "page_content": docs[i].page_content,
+                "metadata": docs[i].metadata,
+                "parent_row": parent_rows.get(docs[i].metadata.get("parent_id")),
+            }
+            for i in order
+        ],
+    )
+
+    with open(os.path.join(path, DOCUMENTS_FILE), "w") as f:
+        json.dump(adapter.get_unique_documents_metadata(), f)
+    with open(os.path.join(path, HEADER_FILE), "w") as f:
+        json.dump({"count": len(order), "dim": int(vectors.shape[1])}, f)
+
+
+class SharedFAISSAdapter(VectorStoreInterface):
+    """Read-only vector store over files written by `export_shared_index`.
+
+    Vectors and chunks are memory-mapped rather than loaded, so every worker process on a node
+    shares one copy through the page cache and only decodes the chunks it returns. Search is
+    exact brute-force L2 (`faiss.knn`) directly over the mapped vectors.
+    """
+
+    def __init__(self, embedding_model):
+        self.embedding_model = embedding_model
+        self._vectors: Optional[np.ndarray] = None
+        self._chunks: Optional[_MappedRecords] = None
+        self._parents: Optional[_MappedRecords] = None
+        self._documents: List[dict] = []
+
+    def load(self, path: str):
+        with open(os.path.join(path, HEADER_FILE), "r") as f:
+            header = json.load(f)
+        self._vectors = np.memmap(
+            os.path.join(path, VECTORS_FILE),
+            dtype="float32",
+            mode="r",
+            shape=(header["count"], header["dim"]),
+        )
+        self._chunks = _MappedRecords(os.path.join(path, CHUNKS_FILE))
+        self._parents = _MappedRecords(os.path.join(path, PARENTS_FILE))
+        with open(os.path.join(path, DOCUMENTS_FILE), "r") as f:
+            self._documents = json.load(f)
+
+    def _check_loaded(self):
+        if self._vectors is None:
+            raise ValueError("Index not loaded.")
+
+    @staticmethod
+    def _to_document(record: dict) -> Document:
+        doc = Document(page_content=record["page_content"], metadata=record["metadata"])
+        if "source" not in doc.metadata:
+            doc.metadata["source"] = doc.metadata.get("source_chunk", "unknown")
+        return doc
+
+    def _doc_at(self, row: int) -> Document:
+        return self._to_document(self._chunks[row])
+
+    def _parents_for(self, hits: List[Tuple[int, float]], k: int) -> List[Document]:
+        children = []
+        parents = {}
+        for row, distance in hits:
+            record = self._chunks[row]
+            child = self._to_document(record)
+            children.append((child, distance))
+            parent_id = child.metadata.get("parent_id")
+            if record.get("parent_row") is not None and parent_id not in parents:
+                parents[parent_id] = self._to_document(self._parents[record["parent_row"]])
+        return select_parents(children, parents, k)
+
+    def _search(self, embeddings, k: int) -> List[List[Tuple[int, float]]]:
+        queries = np.asarray(embeddings, dtype="float32").reshape(-1, self._vectors.shape[1])
+        distances, ids = faiss.knn(queries, self._vectors, min(k, len(self._vectors)))
+        return [
+            [(int(i), float(d)) for i, d in zip(row_ids, row_distances) if i >= 0]
+            for row_ids, row_distances in zip(ids, distances)
+        ]
+
+    def _expand_neighbors(self, hits: List[Tuple[int, float]], window: int) -> List[Document]:
+        enriched = set()
+        results = []
+        for row, _ in hits:
+            doc = self._doc_at(row)
+            src, center_idx = _chunk_key(doc)
+            if center_idx < 0:
+                results.append(doc)
+                continue
+            for offset in range(-window, window + 1):
+                neighbor_row = row + offset
+                if (src, center_idx + offset) in enriched:
+                    continue
+                if not 0 <= neighbor_row < len(self._vectors):
+                    continue
+                neighbor = doc if offset == 0 else self._doc_at(neighbor_row)
+                if _chunk_key(neighbor) == (src, center_idx + offset):
+                    results.append(neighbor)
+                    enriched.add((src, center_idx + offset))
+        return results
+
+    def add_documents(self, docs: List[Document]):
+        raise NotImplementedError("Shared index is read-only; rebuild and publish a new version.")
+
+    def save(self, path: str):
+        raise NotImplementedError("Shared index is read-only; rebuild and publish a new version.")
+
+    def similarity_search(self, query: str, k: int = 4) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k)]
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4
+    ) -> List[Tuple[Document, float]]:
+        self._check_loaded()
+        hits = self._search(self.embedding_model.embed_query(query), k)[0]
+        return [(self._doc_at(row), distance) for row, distance in hits]
+
+    def similarity_search_with_neighbors(
+        self, query: str, k: int = 4, window: int = 1
+    ) -> List[Document]:
+        self._check_loaded()
+        hits = self._search(self.embedding_model.embed_query(query), k)[0]
+        return self._expand_neighbors(hits, window)
+
+    def batch_similarity_search(
+        self, queries: List[str], k: int = 4
+    ) -> List[List[Document]]:
+        self._check_loaded()
+        rows = self._search(self.embedding_model.embed_documents(queries), k)
+        return [[self._doc_at(row) for row, _ in hits] for hits in rows]
+
+    def batch_similarity_search_with_neighbors(
+        self, queries: List[str], k: int = 4, window: int = 1
+    ) -> List[List[Document]]:
+        self._check_loaded()
+        rows = self._search(self.embedding_model.embed_documents(queries), k)
+        return [self._expand_neighbors(hits, window) for hits in rows]
+
+    def similarity_search_with_parents(
+        self, query: str, k: int = 4, fetch_k: Optional[int] = None
+    ) -> List[Document]:
+        self._check_loaded()
+        hits = self._search(self.embedding_model.embed_query(query), fetch_k or 4 * k)[0]
+        return self._parents_for(hits, k)
+
+    def batch_similarity_search_with_parents(
+        self, queries: List[str], k: int = 4, fetch_k: Optional[int] = None
+    ) -> List[List[Document]]:
+        self._check_loaded()
+        rows = self._search(self.embedding_model.embed_documents(queries), fetch_k or 4 * k)
+        return [self._parents_for(hits, k) for hits in rows]
+
+    def as_retriever(self, search_type: str = "similarity", **kwargs):
+        raise NotImplementedError("Retriever interface is not available for the shared index.")
+
+    def get_unique_documents_metadata(self) -> List[dict]:
+        self._check_loaded()
+        return self._documents
@@ -1,13 +1,109 @@
+import base64
+import json
+import logging
+import os
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Literal, Optional, Tuple
 
+import faiss
+import numpy as np
 from langchain.embeddings import OpenAIEmbeddings
 from langchain.schema import Document
 from langchain.vectorstores import FAISS
 from langchain.vectorstores.azuresearch import AzureSearch
+from langchain_community.vectorstores.azuresearch import (
+    FIELDS_CONTENT,
+    FIELDS_CONTENT_VECTOR,
+    FIELDS_ID,
+    FIELDS_METADATA,
+)
+
+from data_ingestion.azure_search_client import AzureSearchRestClient
+
+logger = logging.getLogger(__name__)
+
+VectorStorage = Literal["float32", "float16", "int8", "pq"]
+
+VECTORS_FILE = "vectors.f32"
+STORAGE_FILE = "storage.json"
+PARENTS_FILE = "parents.json"
+
+
+def select_parents(
+    hits: List[Tuple[Document, float]], parents: dict, k: int
+) -> List[Document]:
+    """Map child hits to their parent spans, deduplicated in rank order, up to `k` results.
+
+    Children without a known parent are returned as-is.
+    """
+    seen = set()
+    results = []
+    for doc, _ in hits:
+        parent_id = doc.metadata.get("parent_id")
+        parent = parents.get(parent_id) if parent_id else None
+        key = parent_id if parent is not None else doc.metadata.get("source_chunk")
+        if key in seen:
+            continue
+        seen.add(key)
+        result = parent if parent is not None else doc
+        if "source" not in result.metadata:
+            result.metadata["source"] = result.metadata.get("source_chunk", "unknown")
+        results.append(result)
+        if len(results) == k:
+            break
+    return results
+
+
+def build_quantized_index(
+    vectors: np.ndarray, storage: VectorStorage, pq_subquantizers: Optional[int] = None
+) -> Tuple[faiss.Index, VectorStorage]:
+    """Build an L2 FAISS index holding `vectors` in the requested compressed representation.
+
+    PQ defaults to one 8-bit code per 16 dimensions (96 bytes per ada-002 vector). Returns the
+    index and the storage actually used, which is int8 when there are too few vectors for PQ.
+    """
+    dim = vectors.shape[1]
+    if storage == "pq" and len(vectors) < 256:
+        # PQ needs at least one training point per centroid (2**8 per subquantizer)
+        logger.warning(f"Only {len(vectors)} vectors, too few to train PQ; using int8 instead.")
+        storage = "int8"
+
+    if storage == "float32":
+        index = faiss.IndexFlatL2(dim)
+    elif storage == "float16":
+        index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_fp16)
+    elif storage == "int8":
+        index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_8bit)
+    elif storage == "pq":
+        if pq_subquantizers is None:
+            # Subquantizer count must divide the dimension
+            pq_subquantizers = max(m for m in range(1, max(dim // 16, 1) + 1) if dim % m == 0)
+        index = faiss.IndexPQ(dim, pq_subquantizers, 8)
+    else:
+        raise ValueError(f"Invalid vector storage: {storage}")
+
+    if not index.is_trained:
+        index.train(vectors)
+    index.add(vectors)
+    return index, storage
+
+
+def _write_vectors(vectors: np.ndarray, path: str):
+    if (
+        isinstance(vectors, np.memmap)
+        and os.path.exists(path)
+        and os.path.samefile(vectors.filename, path)
+    ):
+        # Saving a loaded index back to its own directory; the file is already there
+        return
+    np.ascontiguousarray(vectors, dtype="float32").tofile(path)
 
 
 class VectorStoreInterface(ABC):
+    # Whether `save` writes index files; hosted stores keep their data remotely
+    saves_locally: bool = True
+
     @abstractmethod
     def add_documents(self, docs: List[Document]):
         pass
@@ -34,6 +130,45 @@ class VectorStoreInterface(ABC):
             "This method is not implemented for this vector store."
         )
 
+    def batch_similarity_search(
+        self, queries: List[str], k: int = 4
+    ) -> List[List[Document]]:
+        return [self.similarity_search(query, k=k) for query in queries]
+
+    def batch_similarity_search_with_neighbors(
+        self, queries: List[str], k: int = 4, window: int = 1
+    ) -> List[List[Document]]:
+        return [
+            self.similarity_search_with_neighbors(query, k=k, window=window)
+            for query in queries
+        ]
+
+    def add_embeddings(self, docs: List[Document], embeddings):
+        """Add documents whose vectors were computed up front (e.g. restored from a checkpoint)."""
+        raise NotImplementedError(
+            "Precomputed embeddings are not supported for this vector store."
+        )
+
+    def add_parent_documents(self, parents: List[Document]):
+        raise NotImplementedError(
+            "Parent-child retrieval is not implemented for this vector store."
+        )
+
+    def similarity_search_with_parents(
+        self, query: str, k: int = 4, fetch_k: Optional[int] = None
+    ) -> List[Document]:
+        raise NotImplementedError(
+            "Parent-child retrieval is not implemented for this vector store."
+        )
+
+    def batch_similarity_search_with_parents(
+        self, queries: List[str], k: int = 4, fetch_k: Optional[int] = None
+    ) -> List[List[Document]]:
+        return [
+            self.similarity_search_with_parents(query, k=k, fetch_k=fetch_k)
+            for query in queries
+        ]
+
     @abstractmethod
     def load(self, path: str):
         pass
@@ -44,28 +179,156 @@ class VectorStoreInterface(ABC):
 
 
 class FAISSAdapter(VectorStoreInterface):
+    """FAISS-backed vector store.
+
+    With a compressed `storage` ("float16", "int8" or "pq") the saved search index is
+    quantized, while the float32 vectors go to a side file that is memory-mapped on load
+    (`compress` does the same in memory). Searches
+    fetch `rerank_factor * k` candidates from the compressed index and re-rank them by exact
+    L2 distance against the side file.
+
+    Parent spans registered with `add_parent_documents` are kept in a child -> parent lookup
+    (by the children's `parent_id`) and saved next to the index.
+    """
+
     def __init__(
-        self, embedding_model=None, model_name: str = "text-embedding-ada-002"
+        self,
+        embedding_model=None,
+        model_name: str = "text-embedding-ada-002",
+        storage: VectorStorage = "float32",
+        rerank_factor: int = 4,
     ):
         self.embedding_model = embedding_model or OpenAIEmbeddings(model=model_name)
         self.index = None
+        self.storage = storage
+        self.rerank_factor = rerank_factor
+        self._vectors: Optional[np.ndarray] = None
+        self.parents = {}
 
     def add_documents(self, docs: List[Document]):
+        if self._vectors is not None:
+            raise ValueError("Cannot add documents to a compressed index; rebuild it instead.")
         if self.index is None:
             self.index = FAISS.from_documents(docs, self.embedding_model)
         else:
             self.index.add_documents(docs)
 
+    def add_embeddings(self, docs: List[Document], embeddings):
+        if self._vectors is not None:
+            raise ValueError("Cannot add documents to a compressed index; rebuild it instead.")
+        text_embeddings = [
+            (doc.page_content, [float(x) for x in vector])
+            for doc, vector in zip(docs, embeddings)
+        ]
+        metadatas = [doc.metadata for doc in docs]
+        if self.index is None:
+            self.index = FAISS.from_embeddings(
+                text_embeddings, self.embedding_model, metadatas=metadatas
+            )
+        else:
+            self.index.add_embeddings(text_embeddings, metadatas=metadatas)
+
+    def add_parent_documents(self, parents: List[Document]):
+        for parent in parents:
+            self.parents[parent.metadata["source_chunk"]] = parent
+
     def save(self, path: str):
-        if self.index:
-            self.index.save_local(path)
+        """Write the index to `path` in the configured storage; the adapter itself is unchanged.
+
+        An adapter that hasn't been `compress`ed gets a quantized copy written, so every save
+        path holds a complete index and vectors file.
+        """
+        if not self.index:
+            return
+        index = self.index
+        vectors = self._vectors
+        storage = self.storage
+        if self.storage != "float32" and vectors is None:
+            vectors = index.index.reconstruct_n(0, index.index.ntotal)
+            quantized, storage = build_quantized_index(vectors, self.storage)
+            index = FAISS(
+                embedding_function=index.embedding_function,
+                index=quantized,
+                docstore=index.docstore,
+                index_to_docstore_id=index.index_to_docstore_id,
+            )
+        index.save_local(path)
+        if vectors is not None:
+            _write_vectors(vectors, os.path.join(path, VECTORS_FILE))
+            with open(os.path.join(path, STORAGE_FILE), "w") as f:
+                json.dump({"storage": storage, "dim": vectors.shape[1]}, f)
+        if self.parents:
+            with open(os.path.join(path, PARENTS_FILE), "w") as f:
+                json.dump(
+                    {
+                        parent_id: {
+                            "page_content": parent.page_content,
+                            "metadata": parent.metadata,
+                        }
+                        for parent_id, parent in self.parents.items()
+                    },
+                    f,
+                )
+
+    def compress(self):
+        """Quantize the in-memory search index to `storage`, keeping float32 vectors for re-ranking.
+
+        No-op for float32 storage or an index that is already compressed.
+        """
+        if self.index is None or self.storage == "float32" or self._vectors is not None:
+            return
+        flat = self.index.index
+        vectors = flat.reconstruct_n(0, flat.ntotal)
+        self.index.index, self.storage = build_quantized_index(vectors, self.storage)
+        self._vectors = vectors
+
+    def memory_usage(self) -> dict:
+        """Bytes held by the in-memory search index compared with plain float32 storage."""
+        if self.index is None:
+            raise ValueError("Index not loaded.")
+        index = self.index.index
+        float32_bytes = index.ntotal * index.d * 4
+        index_bytes = index.ntotal * index.sa_code_size()
+        return {
+            # Until `compress`, the in-memory index is flat whatever the configured storage
+            "storage": self.storage if self._vectors is not None else "float32",
+            "vectors": index.ntotal,
+            "index_bytes": index_bytes,
+            "float32_bytes": float32_bytes,
+            "saved_bytes": float32_bytes - index_bytes,
+        }
+
+    def _search_reranked(
+        self, embeddings: np.ndarray, k: int
+    ) -> List[List[Tuple[int, float]]]:
+        """Return, per query, (position, squared L2 distance) pairs for the exact top-k among the candidates."""
+        queries = np.asarray(embeddings, dtype="float32").reshape(-1, self.index.index.d)
+        n_candidates = min(k * self.rerank_factor, self.index.index.ntotal)
+        _, ids = self.index.index.search(queries, n_candidates)
+        rows = []
+        for query, row_ids in zip(queries, ids):
+            # Sorted ids keep memmap reads sequential
+            candidates = np.sort(row_ids[row_ids >= 0])
+            distances = np.sum((self._vectors[candidates] - query) ** 2, axis=1)
+            order = np.argsort(distances)[:k]
+            rows.append([(int(candidates[i]), float(distances[i])) for i in order])
+        return rows
+
+    def _docs_with_score(self, query: str, k: int) -> List[Tuple[Document, float]]:
+        if self._vectors is None:
+            return self.index.similarity_search_with_score(query, k=k)
+        embedding = self.embedding_model.embed_query(query)
+        return [
+            (self._doc_at(pos), distance)
+            for pos, distance in self._search_reranked(embedding, k)[0]
+        ]
 
     def similarity_search(self, query: str, k: int = 4) -> List[Document]:
         if self.index is None:
             raise ValueError(
                 "No index available. Please add documents first or load an existing index."
             )
-        return self.index.similarity_search(query, k=k)
+        return [doc for doc, _ in self._docs_with_score(query, k)]
 
     def similarity_search_with_score(
         self, query: str, k: int = 4
@@ -74,7 +337,7 @@ class FAISSAdapter(VectorStoreInterface):
             raise ValueError(
                 "No index available. Please add documents first or load an existing index."
             )
-        return self.index.similarity_search_with_score(query, k=k)
+        return self._docs_with_score(query, k)
 
     def similarity_search_with_neighbors(
         self, query: str, k: int = 4, window: int = 1
@@ -83,12 +346,80 @@ class FAISSAdapter(VectorStoreInterface):
             raise ValueError("Index not loaded.")
 
         # Top-k base results
-        hits = self.index.similarity_search_with_score(query, k=k)
+        hits = self._docs_with_score(query, k)
+        results = self._expand_neighbors(hits, self._chunk_groups(), window)
+        print("results", results)
+        return results
+
+    def similarity_search_with_parents(
+        self, query: str, k: int = 4, fetch_k: Optional[int] = None
+    ) -> List[Document]:
+        """Search child chunks and return up to `k` distinct parent spans."""
+        if self.index is None:
+            raise ValueError("Index not loaded.")
+        hits = self._docs_with_score(query, fetch_k or 4 * k)
+        return select_parents(hits, self.parents, k)
+
+    def batch_similarity_search_with_parents(
+        self, queries: List[str], k: int = 4, fetch_k: Optional[int] = None
+    ) -> List[List[Document]]:
+        if self.index is None:
+            raise ValueError("Index not loaded.")
+        return [
+            select_parents(hits, self.parents, k)
+            for hits in self._batch_docs_with_score(queries, fetch_k or 4 * k)
+        ]
+
+    def batch_similarity_search(
+        self, queries: List[str], k: int = 4
+    ) -> List[List[Document]]:
+        if self.index is None:
+            raise ValueError("Index not loaded.")
+        return [
+            [doc for doc, _ in hits] for hits in self._batch_docs_with_score(queries, k)
+        ]
+
+    def batch_similarity_search_with_neighbors(
+        self, queries: List[str], k: int = 4, window: int = 1
+    ) -> List[List[Document]]:
+        if self.index is None:
+            raise ValueError("Index not loaded.")
+        # One embedding request, one matrix search and one neighbor lookup for all queries
+        grouped = self._chunk_groups()
+        return [
+            self._expand_neighbors(hits, grouped, window)
+            for hits in self._batch_docs_with_score(queries, k)
+        ]
+
+    def _batch_docs_with_score(
+        self, queries: List[str], k: int
+    ) -> List[List[Tuple[Document, float]]]:
+        embeddings = np.asarray(
+            self.embedding_model.embed_documents(queries), dtype="float32"
+        )
+        return self._search_embeddings(embeddings, k)
+
+    def _search_embeddings(
+        self, embeddings: np.ndarray, k: int
+    ) -> List[List[Tuple[Document, float]]]:
+        """Search with precomputed query vectors; distances are squared L2 in every storage mode."""
+        if self._vectors is None:
+            distances, ids = self.index.index.search(embeddings, k)
+            rows = [
+                [(int(i), float(d)) for i, d in zip(row_ids, row_distances) if i >= 0]
+                for row_ids, row_distances in zip(ids, distances)
+            ]
+        else:
+            rows = self._search_reranked(embeddings, k)
+        return [[(self._doc_at(pos), distance) for pos, distance in row] for row in rows]
+
+    def _doc_at(self, position: int) -> Document:
+        return self.index.docstore.search(self.index.index_to_docstore_id[position])
 
-        # Prepare lookup from FAISS's internal docstore
-        all_docs = list(self.index.docstore._dict.values())
+    def _chunk_groups(self) -> dict:
+        """Map source -> {chunk index: doc} for every chunk in FAISS's internal docstore."""
         grouped = {}
-        for doc in all_docs:
+        for doc in self.index.docstore._dict.values():
             # Ensure source metadata exists
             if "source" not in doc.metadata:
                 doc.metadata["source"] = doc.metadata.get("source_chunk", "unknown")
@@ -102,8 +433,13 @@ class FAISSAdapter(VectorStoreInterface):
             except ValueError:
                 continue
             grouped.setdefault(src, {})[idx] = doc
+        return grouped
 
-        # Pull neighbors around each hit
+    @staticmethod
+    def _expand_neighbors(
+        hits: List[Tuple[Document, float]], grouped: dict, window: int
+    ) -> List[Document]:
+        """Pull the chunks within `window` around each hit, each chunk at most once."""
         enriched = set()
         results = []
 
@@ -130,15 +466,38 @@ class FAISSAdapter(VectorStoreInterface):
                     neighbor = grouped[src][i]
                     results.append(neighbor)
                     enriched.add((src, i))
-        print("results", results)
         return results
 
     def load(self, path: str):
         self.index = FAISS.load_local(
             path, self.embedding_model, allow_dangerous_deserialization=True
         )
+        self._vectors = None
+        storage_path = os.path.join(path, STORAGE_FILE)
+        if os.path.exists(storage_path):
+            with open(storage_path, "r") as f:
+                storage = json.load(f)
+            self.storage = storage["storage"]
+            self._vectors = np.memmap(
+                os.path.join(path, VECTORS_FILE),
+                dtype="float32",
+                mode="r",
+                shape=(self.index.index.ntotal, storage["dim"]),
+            )
+        else:
+            self.storage = "float32"
+
+        self.parents = {}
+        parents_path = os.path.join(path, PARENTS_FILE)
+        if os.path.exists(parents_path):
+            with open(parents_path, "r") as f:
+                self.parents = {
+                    parent_id: Document(**parent)
+                    for parent_id, parent in json.load(f).items()
+                }
 
     def as_retriever(self, search_type: str = "similarity", **kwargs):
+        # Note: LangChain's retriever searches the (possibly compressed) index without re-ranking
         if self.index is None:
             raise ValueError(
                 "No index available. Please add documents first or load an existing index."
@@ -168,11 +527,124 @@ class FAISSAdapter(VectorStoreInterface):
 
 
 class AzureSearchAdapter(VectorStoreInterface):
-    def __init__(self, azure_search: AzureSearch):
+    """Azure AI Search store.
+
+    Similarity search goes through LangChain's `AzureSearch`. Uploads and neighbor lookups use
+    `rest_client` directly: documents are embedded and indexed in `batch_size` batches over
+    `max_workers` parallel requests, and the neighbors of all hits are fetched with a single
+    filter query on the filterable `source_chunk` field.
+    """
+
+    saves_locally = False
+
+    def __init__(
+        self,
+        azure_search: AzureSearch,
+        rest_client: Optional[AzureSearchRestClient] = None,
+        embedding_model=None,
+        batch_size: int = 500,
+        max_workers: int = 4,
+    ):
         self.store = azure_search
+        self.rest_client = rest_client
+        self.embedding_model = embedding_model
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+
+    @classmethod
+    def from_env(
+        cls, embedding_model, vector_dimensions: int = 1536, **kwargs
+    ) -> "AzureSearchAdapter":
+        """Build the adapter from AZURE_SEARCH_ENDPOINT, AZURE_SEARCH_KEY and AZURE_INDEX_NAME."""
+        from azure.search.documents.indexes.models import (
+            SearchableField,
+            SearchField,
+            SearchFieldDataType,
+            SimpleField,
+        )
+
+        endpoint = os.getenv("AZURE_SEARCH_ENDPOINT")
+        key = os.getenv("AZURE_SEARCH_KEY")
+        index_name = os.getenv("AZURE_INDEX_NAME")
+        # LangChain's default schema plus a filterable source_chunk for neighbor lookups
+        fields = [
+            SimpleField(
+                name=FIELDS_ID, type=SearchFieldDataType.String, key=True, filterable=True
+            ),
+            SearchableField(name=FIELDS_CONTENT, type=SearchFieldDataType.String),
+            SearchField(
+                name=FIELDS_CONTENT_VECTOR,
+                type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
+                searchable=True,
+                vector_search_dimensions=vector_dimensions,
+                vector_search_profile_name="myHnswProfile",
+            ),
+            SearchableField(name=FIELDS_METADATA, type=SearchFieldDataType.String),
+            SimpleField(
+                name="source_chunk", type=SearchFieldDataType.String, filterable=True
+            ),
+        ]
+        azure_search = AzureSearch(
+            azure_search_endpoint=endpoint,
+            azure_search_key=key,
+            index_name=index_name,
+            embedding_function=embedding_model.embed_query,
+            fields=fields,
+        )
+        rest_client = AzureSearchRestClient(endpoint, key, index_name, key_field=FIELDS_ID)
+        return cls(azure_search, rest_client, embedding_model, **kwargs)
+
+    @staticmethod
+    def _document_key(doc: Document) -> str:
+        # Deterministic keys make retried or repeated uploads idempotent
+        chunk_ref = doc.metadata.get("source_chunk")
+        if chunk_ref:
+            return base64.urlsafe_b64encode(chunk_ref.encode("utf-8")).decode("ascii")
+        return base64.urlsafe_b64encode(os.urandom(16)).decode("ascii")
+
+    def _upload_batch(self, docs: List[Document], vectors=None):
+        if vectors is None:
+            vectors = self.embedding_model.embed_documents(
+                [doc.page_content for doc in docs]
+            )
+        self.rest_client.index_documents(
+            [
+                {
+                    FIELDS_ID: self._document_key(doc),
+                    FIELDS_CONTENT: doc.page_content,
+                    FIELDS_CONTENT_VECTOR: np.asarray(vector, dtype=np.float32).tolist(),
+                    FIELDS_METADATA: json.dumps(doc.metadata),
+                    "source_chunk": doc.metadata.get("source_chunk"),
+                }
+                for doc, vector in zip(docs, vectors)
+            ]
+        )
 
     def add_documents(self, docs: List[Document]):
-        self.store.add_documents(docs)
+        if self.rest_client is None:
+            self.store.add_documents(docs)
+            return
+
+        self._upload_parallel(docs)
+
+    def add_embeddings(self, docs: List[Document], embeddings):
+        if self.rest_client is None:
+            raise NotImplementedError(
+                "Precomputed embeddings for Azure Search need a rest_client."
+            )
+        self._upload_parallel(docs, list(embeddings))
+
+    def _upload_parallel(self, docs: List[Document], embeddings=None):
+        starts = range(0, len(docs), self.batch_size)
+        batches = [docs[start : start + self.batch_size] for start in starts]
+        vector_batches = [
+            None if embeddings is None else embeddings[start : start + self.batch_size]
+            for start in starts
+        ]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            uploads = pool.map(self._upload_batch, batches, vector_batches)
+            for done, _ in enumerate(uploads, start=1):
+                logger.info(f"Uploaded batch {done}/{len(batches)} to Azure Search")
 
     def save(self, path: str):
         # Azure Search is cloud-based, no local saving needed
@@ -186,6 +658,70 @@ class AzureSearchAdapter(VectorStoreInterface):
     ) -> List[Tuple[Document, float]]:
         return self.store.similarity_search_with_score(query, k=k)
 
+    def _fetch_chunks(self, chunk_refs: List[str]) -> dict:
+        """Fetch documents by `source_chunk` in one filter query."""
+        if not chunk_refs:
+            return {}
+        # OData string literals escape quotes by doubling; sanitized filenames contain no "|"
+        values = "|".join(ref.replace("'", "''") for ref in chunk_refs)
+        results = self.rest_client.search(
+            {
+                "search": "*",
+                "filter": f"search.in(source_chunk, '{values}', '|')",
+                "select": f"{FIELDS_CONTENT},{FIELDS_METADATA},source_chunk",
+                "top": len(chunk_refs),
+            }
+        )
+        fetched = {}
+        for result in results:
+            metadata = json.loads(result.get(FIELDS_METADATA) or "{}")
+            fetched[result["source_chunk"]] = Document(
+                page_content=result[FIELDS_CONTENT], metadata=metadata
+            )
+        return fetched
+
+    def similarity_search_with_neighbors(
+        self, query: str, k: int = 4, window: int = 1
+    ) -> List[Document]:
+        if self.rest_client is None:
+            raise NotImplementedError(
+                "Neighbor retrieval for Azure Search needs a rest_client."
+            )
+        hits = self.store.similarity_search_with_score(query, k=k)
+
+        centers = []
+        wanted = []
+        for doc, _ in hits:
+            chunk_ref = doc.metadata.get("source_chunk") or ""
+            src, _, idx_str = chunk_ref.rpartition("/")
+            if not src or not idx_str.isdigit():
+                centers.append((doc, None, None))
+                continue
+            centers.append((doc, src, int(idx_str)))
+            wanted.extend(
+                f"{src}/{int(idx_str) + offset}"
+                for offset in range(-window, window + 1)
+                if offset and int(idx_str) + offset >= 0
+            )
+        fetched = self._fetch_chunks(list(dict.fromkeys(wanted)))
+
+        enriched = set()
+        results = []
+        for doc, src, center_idx in centers:
+            if "source" not in doc.metadata:
+                doc.metadata["source"] = doc.metadata.get("source_chunk", "unknown")
+            if src is None:
+                results.append(doc)
+                continue
+            for offset in range(-window, window + 1):
+                chunk_ref = f"{src}/{center_idx + offset}"
+                neighbor = doc if offset == 0 else fetched.get(chunk_ref)
+                if neighbor is not None and chunk_ref not in enriched:
+                    neighbor.metadata.setdefault("source", chunk_ref)
+                    results.append(neighbor)
+                    enriched.add(chunk_ref)
+        return results
+
     def load(self, path: str):
         # Azure Search is cloud-based, no loading needed
         pass
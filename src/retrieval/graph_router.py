@@ -1,12 +1,23 @@
-from typing import Any
+from typing import Any, AsyncIterator, List
 
 from langchain.chat_models import ChatOpenAI
 from langchain.schema import Document
 from langchain.tools import BaseTool
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import END, START, StateGraph
 from typing_extensions import TypedDict
 
-from retrieval.retriever import CustomRetrievalQA
+from retrieval.retriever import SOURCES_MARKER, CustomRetrievalQA, SourcesStripper
+
+
+def _failed(question: str, route, error: BaseException) -> dict:
+    return {
+        "question": question,
+        "route": route,
+        "answer": None,
+        "source_documents": [],
+        "error": f"{type(error).__name__}: {error}",
+    }
 
 
 class MetadataTool(BaseTool):
@@ -45,6 +56,13 @@ class RetrievalGraph:
         answer: str
         source_documents: list[Document]
 
+    # Answering nodes and the marker their answers are cut at (None: whitespace only), so
+    # streamed tokens add up to the node's final answer
+    ANSWER_TRIMMING = {
+        "default_retriever": SOURCES_MARKER,
+        "metadata_tool_node": None,
+    }
+
     def __init__(self, retriever_chain: CustomRetrievalQA):
         self.llm = ChatOpenAI(temperature=0)
         self.retriever_chain = retriever_chain
@@ -57,7 +75,10 @@ class RetrievalGraph:
 
     def _metadata_tool_node(self, state: dict) -> dict:
         question = state["question"]
+        response = self.llm.invoke(self._metadata_prompt(question)).content.strip()
+        return {"question": question, "answer": response, "source_documents": []}
 
+    def _metadata_prompt(self, question: str) -> str:
         try:
             documents_info = self.vectorstore.get_unique_documents_metadata()
         except Exception:
@@ -73,14 +94,15 @@ class RetrievalGraph:
             "about indexed earnings call documents. Based on the metadata, answer the user's question."
         )
 
-        prompt = f"{system_prompt}\n\nMetadata:\n{doc_context}\n\nQuestion: {question}\nAnswer:"
-
-        response = self.llm.invoke(prompt).content.strip()
-
-        return {"question": question, "answer": response, "source_documents": []}
+        return f"{system_prompt}\n\nMetadata:\n{doc_context}\n\nQuestion: {question}\nAnswer:"
 
     def _route_question(self, question: str) -> str:
-        prompt = f"""
+        routing_decision = self.llm.invoke(self._routing_prompt(question)).content
+        return self._parse_route(routing_decision)
+
+    @staticmethod
+    def _routing_prompt(question: str) -> str:
+        return f"""
         You are a router that decides if a question should be handled by the default retriever or a metadata tool.
         Answer with 'metadata_tool_node' for questions like:
         - "When was the most recent earnings call?"
@@ -91,7 +113,10 @@ class RetrievalGraph:
         Question: {question}
         Only answer with 'metadata_tool_node' or 'default_retriever'.
         """
-        routing_decision = self.llm.invoke(prompt).content.strip().lower()
+
+    @staticmethod
+    def _parse_route(routing_decision: str) -> str:
+        routing_decision = routing_decision.strip().lower()
         return (
             routing_decision
             if routing_decision in ["default_retriever", "metadata_tool_node"]
@@ -116,3 +141,83 @@ class RetrievalGraph:
 
     def invoke(self, question: str) -> dict:
         return self.graph.invoke({"question": question})
+
+    async def astream_answer(self, question: str) -> AsyncIterator[dict]:
+        """Run the compiled graph, streaming ``{"token": ...}`` events from the answering node.
+
+        Tokens are the node's LLM output, trimmed the way the node trims its final answer; the
+        router's own output is not streamed. The last event is the state `invoke` returns.
+        """
+        strippers = {}
+        state = {}
+        async for mode, event in self.graph.astream(
+            {"question": question}, stream_mode=["messages", "values"]
+        ):
+            if mode == "values":
+                state = event
+                continue
+            chunk, metadata = event
+            node = metadata.get("langgraph_node")
+            if node not in self.ANSWER_TRIMMING:
+                continue
+            if node not in strippers:
+                strippers[node] = SourcesStripper(marker=self.ANSWER_TRIMMING[node])
+            text = strippers[node].feed(chunk.content)
+            if text:
+                yield {"token": text}
+        for stripper in strippers.values():
+            text = stripper.flush()
+            if text:
+                yield {"token": text}
+        yield state
+
+    def answer_batch(self, questions: List[str], max_concurrency: int = 8) -> List[dict]:
+        """Route and answer many independent questions with batched LLM and retrieval calls.
+
+        Questions whose routing or answering fails get an ``error`` field rather than failing
+        the batch.
+        """
+        config = {"max_concurrency": max_concurrency}
+        routes = [
+            decision if isinstance(decision, BaseException) else self._parse_route(decision.content)
+            for decision in self.llm.batch(
+                [self._routing_prompt(q) for q in questions],
+                config=config,
+                return_exceptions=True,
+            )
+        ]
+
+        retriever_questions = [
+            q for q, route in zip(questions, routes) if route == "default_retriever"
+        ]
+        metadata_questions = [
+            q for q, route in zip(questions, routes) if route == "metadata_tool_node"
+        ]
+        retriever_answers = iter(
+            self.retriever_chain.answer_batch(
+                retriever_questions, max_concurrency=max_concurrency
+            )
+            if retriever_questions
+            else []
+        )
+        metadata_answers = iter(
+            RunnableLambda(self._metadata_tool_node).batch(
+                [{"question": q} for q in metadata_questions],
+                config=config,
+                return_exceptions=True,
+            )
+        )
+
+        results = []
+        for question, route in zip(questions, routes):
+            if isinstance(route, BaseException):
+                results.append(_failed(question, None, route))
+                continue
+            answer = next(
+                retriever_answers if route == "default_retriever" else metadata_answers
+            )
+            if isinstance(answer, BaseException):
+                results.append(_failed(question, route, answer))
+            else:
+                results.append({"question": question, "route": route, **answer})
+        return results
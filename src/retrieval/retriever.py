@@ -1,4 +1,5 @@
-from typing import Any, Dict, List, Literal, Optional
+import logging
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
 from langchain.base_language import BaseLanguageModel
 from langchain.chains.base import Chain
@@ -7,6 +8,81 @@ from langchain.memory.chat_memory import BaseChatMemory
 from langchain.schema import Document
 from pydantic import PrivateAttr
 
+logger = logging.getLogger(__name__)
+
+SOURCES_MARKER = "SOURCES:"
+
+
+def strip_sources(text: str) -> str:
+    return text.split(SOURCES_MARKER)[0].strip()
+
+
+class SourcesStripper:
+    """Incremental `strip_sources` for streamed answers.
+
+    Text that could still turn out to be the start of the "SOURCES:" marker, and trailing
+    whitespace, is held back until the next token settles it, so the concatenated output
+    equals `strip_sources` of the full answer. With `marker` None it only strips whitespace,
+    like ``str.strip``.
+    """
+
+    def __init__(self, marker: Optional[str] = SOURCES_MARKER):
+        self._marker = marker or ""
+        self._buffer = ""
+        self._started = False
+        self._done = False
+
+    def feed(self, token: str) -> str:
+        if self._done:
+            return ""
+        self._buffer += token
+        if not self._started:
+            self._buffer = self._buffer.lstrip()
+            self._started = bool(self._buffer)
+
+        marker_at = self._buffer.find(self._marker) if self._marker else -1
+        if marker_at >= 0:
+            self._done = True
+            out, self._buffer = self._buffer[:marker_at].rstrip(), ""
+            return out
+
+        held = 0
+        for size in range(min(len(self._marker) - 1, len(self._buffer)), 0, -1):
+            if self._marker.startswith(self._buffer[-size:]):
+                held = size
+                break
+        emit_to = len(self._buffer) - held
+        emit_to = len(self._buffer[:emit_to].rstrip())
+        out, self._buffer = self._buffer[:emit_to], self._buffer[emit_to:]
+        return out
+
+    def flush(self) -> str:
+        out, self._buffer = ("" if self._done else self._buffer.rstrip()), ""
+        self._done = True
+        return out
+
+
+def _error_message(error: BaseException) -> str:
+    return f"{type(error).__name__}: {error}"
+
+
+def _dedupe_context(docs: List[Document]) -> List[Document]:
+    """Drop chunks whose text repeats, or is contained in, another chunk of the same context.
+
+    Transcripts share boilerplate (safe-harbor statements, operator instructions) that
+    retrieval returns once per call, and a short chunk can sit inside a longer neighbor.
+    Of identical chunks the highest ranked is kept; order is otherwise unchanged.
+    """
+    texts = [" ".join(doc.page_content.split()) for doc in docs]
+    return [
+        doc
+        for i, (doc, text) in enumerate(zip(docs, texts))
+        if not any(
+            j != i and text in other and (len(other) > len(text) or j < i)
+            for j, other in enumerate(texts)
+        )
+    ]
+
 
 class CustomRetrievalQA(Chain):
     _llm: BaseLanguageModel = PrivateAttr()
@@ -20,7 +96,7 @@ class CustomRetrievalQA(Chain):
         self,
         llm: BaseLanguageModel,
         vector_store,
-        retrieval_method: Literal["default", "with_neighbors"] = "default",
+        retrieval_method: Literal["default", "with_neighbors", "parent_child"] = "default",
         return_source_documents: bool = True,
         memory: Optional[BaseChatMemory] = None,
     ):
@@ -43,25 +119,96 @@ class CustomRetrievalQA(Chain):
         return ["answer", "source_documents"]
 
     def _get_docs(self, question: str) -> List[Document]:
+        if self._retrieval_method == "parent_child":
+            return self._vector_store.similarity_search_with_parents(question, k=4)
         if self._retrieval_method == "with_neighbors":
             return self._vector_store.similarity_search_with_neighbors(
                 question, k=4, window=1
             )
         return self._vector_store.similarity_search(question, k=4)
 
+    def _get_docs_batch(self, questions: List[str]) -> List[List[Document]]:
+        if self._retrieval_method == "parent_child":
+            return self._vector_store.batch_similarity_search_with_parents(questions, k=4)
+        if self._retrieval_method == "with_neighbors":
+            return self._vector_store.batch_similarity_search_with_neighbors(
+                questions, k=4, window=1
+            )
+        return self._vector_store.batch_similarity_search(questions, k=4)
+
+    def answer_batch(
+        self, questions: List[str], max_concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """Answer independent questions with one retrieval pass and parallel generation.
+
+        A question whose retrieval or generation fails gets an ``error`` (and ``answer`` None)
+        instead of failing the batch. Chat memory is neither read nor updated. Repeated
+        questions are answered once, and duplicate chunks are dropped from each context.
+        """
+        unique_questions = list(dict.fromkeys(questions))
+        docs_per_question, errors = self._get_docs_batch_safe(unique_questions)
+        retrieved = sum(len(docs) for docs in docs_per_question)
+        docs_per_question = [_dedupe_context(docs) for docs in docs_per_question]
+        kept = sum(len(docs) for docs in docs_per_question)
+        logger.info(f"Kept {kept} of {retrieved} retrieved contexts after deduplication")
+
+        to_answer = [i for i, error in enumerate(errors) if error is None]
+        results = self._combine_documents_chain.batch(
+            [
+                {"input_documents": docs_per_question[i], "question": unique_questions[i]}
+                for i in to_answer
+            ],
+            config={"max_concurrency": max_concurrency},
+            return_exceptions=True,
+        )
+        generated = dict(zip(to_answer, results))
+
+        answers = {}
+        for i, (question, docs) in enumerate(zip(unique_questions, docs_per_question)):
+            result = generated.get(i, errors[i])
+            if isinstance(result, BaseException):
+                output = {"answer": None, "error": _error_message(result)}
+            else:
+                output = {"answer": strip_sources(result["output_text"])}
+            if self._return_source_documents:
+                output["source_documents"] = docs
+            answers[question] = output
+        return [answers[question] for question in questions]
+
+    def _get_docs_batch_safe(
+        self, questions: List[str]
+    ) -> Tuple[List[List[Document]], List[Optional[BaseException]]]:
+        """Batched retrieval, falling back to one question at a time to isolate failures."""
+        try:
+            return self._get_docs_batch(questions), [None] * len(questions)
+        except Exception as e:
+            logger.warning(f"Batched retrieval failed ({e}); retrieving questions one by one.")
+
+        docs_per_question, errors = [], []
+        for question in questions:
+            try:
+                docs_per_question.append(self._get_docs(question))
+                errors.append(None)
+            except Exception as e:
+                docs_per_question.append([])
+                errors.append(e)
+        return docs_per_question, errors
+
+    def _history(self) -> str:
+        if not self._memory:
+            return ""
+        memory_vars = self._memory.load_memory_variables({})
+        return memory_vars.get("chat_history", "")
+
     def _call(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         question = inputs["question"]
-
-        history = ""
-        if self._memory:
-            memory_vars = self._memory.load_memory_variables({})
-            history = memory_vars.get("chat_history", "")
+        history = self._history()
 
         docs = self._get_docs(question)
         result = self._combine_documents_chain(
             {"input_documents": docs, "question": f"{history}\n{question}"}
         )
-        stripped_answer = result["output_text"].split("SOURCES:")[0].strip()
+        stripped_answer = strip_sources(result["output_text"])
         output = {"answer": stripped_answer}
         if self._return_source_documents:
             output["source_documents"] = docs
@@ -0,0 +1,441 @@
+import argparse
+import asyncio
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import random
+import resource
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from application import app
+from config import settings
+from data_ingestion.index_versions import IndexVersionStore
+from data_ingestion.partitioned_index import load_faiss_store
+from data_ingestion.shared_index import HEADER_FILE, SHARED_DIR, export_shared_index
+from data_ingestion.vector_handlers import FAISSAdapter
+from retrieval import graph_router
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RETRIEVER_QUESTIONS = [
+    "What revenue guidance did management give for Q2 FY25?",
+    "How did gross margin change compared to last year?",
+    "What did the CEO say about capital allocation and buybacks?",
+    "Which segments drove growth this quarter?",
+    "What risks did management highlight in the outlook?",
+    "How is the company thinking about operating expenses next year?",
+]
+METADATA_QUESTIONS = [
+    "When was the most recent earnings call?",
+    "How many earnings call documents do you have indexed?",
+    "How many pages are in the most recent earnings call?",
+]
+ROUTER_MARKER = "Only answer with 'metadata_tool_node' or 'default_retriever'."
+ANSWER_TEXT = (
+    "Management expects revenue growth in the mid single digits, driven by services, "
+    "with gross margin roughly flat and continued discipline on operating expenses."
+)
+
+
+class StubChatModel(BaseChatModel):
+    """Offline chat model with injectable latency.
+
+    Routing prompts are answered from `METADATA_QUESTIONS`, everything else with a fixed
+    answer streamed word by word. The sync path sleeps with `time.sleep`, so a handler that
+    calls the LLM synchronously on the event loop shows up as loop lag.
+    """
+
+    first_token_latency: float = 0.5
+    token_latency: float = 0.02
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub-chat"
+
+    def _reply(self, messages) -> str:
+        prompt = "\n".join(str(m.content) for m in messages)
+        if ROUTER_MARKER in prompt:
+            if any(q in prompt for q in METADATA_QUESTIONS):
+                return "metadata_tool_node"
+            return "default_retriever"
+        return f"{ANSWER_TEXT}\nSOURCES: stub"
+
+    def _tokens(self, messages) -> List[str]:
+        words = self._reply(messages).split(" ")
+        return [word if i == 0 else f" {word}" for i, word in enumerate(words)]
+
+    def _result(self, text: str) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        tokens = self._tokens(messages)
+        time.sleep(self.first_token_latency + self.token_latency * len(tokens))
+        return self._result("".join(tokens))
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        tokens = self._tokens(messages)
+        await asyncio.sleep(self.first_token_latency + self.token_latency * len(tokens))
+        return self._result("".join(tokens))
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator:
+        time.sleep(self.first_token_latency)
+        for token in self._tokens(messages):
+            time.sleep(self.token_latency)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.first_token_latency)
+        for token in self._tokens(messages):
+            await asyncio.sleep(self.token_latency)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+
+class StubEmbeddings(Embeddings):
+    """Deterministic pseudo-random embeddings with a fixed per-request latency."""
+
+    def __init__(self, dim: int = 1536, latency: float = 0.05):
+        self.dim = dim
+        self.latency = latency
+
+    def _vector(self, text: str) -> List[float]:
+        seed = int(hashlib.md5(text.encode("utf-8")).hexdigest()[:8], 16)
+        return np.random.default_rng(seed).standard_normal(self.dim).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency)
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self.latency)
+        return self._vector(text)
+
+
+def build_synthetic_store(
+    embedding_model: StubEmbeddings, num_docs: int = 20, chunks_per_doc: int = 50
+) -> FAISSAdapter:
+    """Index `num_docs` fake transcripts so retrieval does real FAISS work."""
+    chunks = []
+    for doc_idx in range(num_docs):
+        source = f"earnings_call_{doc_idx:03d}.pdf"
+        for chunk_idx in range(chunks_per_doc):
+            chunks.append(
+                Document(
+                    page_content=f"{source} chunk {chunk_idx}: {ANSWER_TEXT}",
+                    metadata={
+                        "source_doc": source,
+                        "source": source,
+                        "source_chunk": f"{source}/{chunk_idx}",
+                        "num_pages": 20,
+                        "creation_date": f"2024-{doc_idx % 12 + 1:02d}-15",
+                    },
+                )
+            )
+    latency, embedding_model.latency = embedding_model.latency, 0.0
+    vector_store = FAISSAdapter(embedding_model=embedding_model)
+    vector_store.add_documents(chunks)
+    embedding_model.latency = latency
+    return vector_store
+
+
+class _UserSession:
+    """Stands in for `cl.user_session`; each simulated chat runs in its own context."""
+
+    _current: contextvars.ContextVar = contextvars.ContextVar("load_test_session")
+
+    def start(self):
+        self._current.set({})
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._current.get().get(key, default)
+
+    def set(self, key: str, value: Any):
+        self._current.get()[key] = value
+
+
+class _MessageTiming:
+    current: contextvars.ContextVar = contextvars.ContextVar("load_test_message")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_token: Optional[float] = None
+        self.sent: Optional[float] = None
+        self.tokens = 0
+
+
+class _Message:
+    """Stands in for `cl.Message`, recording when tokens arrive instead of sending them."""
+
+    def __init__(self, content: str = "", **kwargs):
+        self.content = content
+
+    async def stream_token(self, token: str):
+        timing = _MessageTiming.current.get()
+        if timing.first_token is None:
+            timing.first_token = time.perf_counter()
+        timing.tokens += 1
+        self.content += token
+
+    async def send(self):
+        _MessageTiming.current.get().sent = time.perf_counter()
+        return self
+
+
+class _ChainlitStub:
+    def __init__(self):
+        self.user_session = _UserSession()
+        self.Message = _Message
+
+
+def rss_bytes() -> int:
+    """Current resident set size, falling back to the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+async def monitor_loop_lag(interval: float, samples: List[float], stop: asyncio.Event):
+    """Record how late the loop wakes a task that asked to sleep for `interval`."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - expected))
+
+
+async def run_session(
+    session_id: int,
+    turns: int,
+    metadata_ratio: float,
+    think_time: float,
+    rng: random.Random,
+    records: List[dict],
+):
+    app.cl.user_session.start()
+    setup_start = time.perf_counter()
+    # Chainlit calls sync hooks directly on the event loop, so do the same here
+    app.setup()
+    setup_time = time.perf_counter() - setup_start
+
+    for turn in range(turns):
+        is_metadata = rng.random() < metadata_ratio
+        question = rng.choice(METADATA_QUESTIONS if is_metadata else RETRIEVER_QUESTIONS)
+        timing = _MessageTiming()
+        _MessageTiming.current.set(timing)
+        error = None
+        try:
+            await app.handle_msg(_Message(content=question))
+        except Exception as e:
+            error = repr(e)
+        records.append(
+            {
+                "session": session_id,
+                "turn": turn,
+                "route": "metadata_tool_node" if is_metadata else "default_retriever",
+                "setup": setup_time if turn == 0 else None,
+                "ttft": timing.first_token - timing.started if timing.first_token else None,
+                "latency": (timing.sent or time.perf_counter()) - timing.started,
+                "tokens": timing.tokens,
+                "error": error,
+            }
+        )
+        if think_time and turn < turns - 1:
+            await asyncio.sleep(rng.expovariate(1 / think_time))
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    ordered = np.asarray(values)
+    return {
+        "p50": float(np.percentile(ordered, 50)),
+        "p90": float(np.percentile(ordered, 90)),
+        "p99": float(np.percentile(ordered, 99)),
+        "max": float(ordered.max()),
+        "mean": float(statistics.fmean(values)),
+    }
+
+
+async def run_load_test(args) -> dict:
+    rng = random.Random(args.seed)
+    records: List[dict] = []
+    lag_samples: List[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_loop_lag(args.lag_interval, lag_samples, stop))
+
+    rss_before = rss_bytes()
+    start = time.perf_counter()
+    sessions = []
+    for session_id in range(args.sessions):
+        # Open-loop Poisson arrivals: new chats keep coming even if earlier ones are slow
+        sessions.append(
+            asyncio.create_task(
+                run_session(
+                    session_id,
+                    args.turns,
+                    args.metadata_ratio,
+                    args.think_time,
+                    random.Random(rng.random()),
+                    records,
+                )
+            )
+        )
+        await asyncio.sleep(rng.expovariate(args.arrival_rate))
+    await asyncio.gather(*sessions)
+    elapsed = time.perf_counter() - start
+    # Sessions (graph, memory) are still referenced by their tasks' contexts here
+    rss_after = rss_bytes()
+
+    stop.set()
+    await monitor
+
+    ok = [r for r in records if not r["error"]]
+    report = {
+        "sessions": args.sessions,
+        "messages": len(records),
+        "errors": len(records) - len(ok),
+        "elapsed_s": elapsed,
+        "throughput_msgs_per_s": len(ok) / elapsed,
+        "latency_s": percentiles([r["latency"] for r in ok]),
+        "ttft_s": percentiles([r["ttft"] for r in ok if r["ttft"] is not None]),
+        "setup_s": percentiles([r["setup"] for r in records if r["setup"] is not None]),
+        "latency_by_route_s": {
+            route: percentiles([r["latency"] for r in ok if r["route"] == route])
+            for route in ("default_retriever", "metadata_tool_node")
+        },
+        "event_loop_lag_s": percentiles(lag_samples),
+        "rss_before_mb": rss_before / 2**20,
+        "rss_after_mb": rss_after / 2**20,
+        "rss_per_session_kb": (rss_after - rss_before) / args.sessions / 1024,
+    }
+    if args.records:
+        with open(args.records, "w") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+    return report
+
+
+def publish_synthetic_index(
+    embedding_model: StubEmbeddings, index_dir: str, num_docs: int, shared: bool
+):
+    """Publish a synthetic index version the way the load step does."""
+    vector_store = build_synthetic_store(embedding_model, num_docs=num_docs)
+    versions = IndexVersionStore(index_dir, keep=1)
+    version_dir = versions.new_version_dir()
+    vector_store.save(version_dir)
+    if shared:
+        export_shared_index(vector_store, os.path.join(version_dir, SHARED_DIR))
+    versions.publish(
+        version_dir, {"vector_store": type(vector_store).__name__, "num_docs": num_docs}
+    )
+
+
+def index_dimension(version_path: str, shared: bool) -> int:
+    if shared:
+        with open(os.path.join(version_path, SHARED_DIR, HEADER_FILE), "r") as f:
+            return json.load(f)["dim"]
+    vector_store = load_faiss_store(version_path, StubEmbeddings())
+    partitions = getattr(vector_store, "partitions", {"": vector_store})
+    return next(p.index.index.d for p in partitions.values() if p.index is not None)
+
+
+def install_stubs(args):
+    """Point the Chainlit app at offline backends with the requested latencies.
+
+    The vector store is loaded by the app itself (`load_vector_store`, so the reloadable
+    proxy and the serving mode's adapter are exercised) with stub embeddings injected.
+    Returns the temporary index root if a synthetic index was published, else None.
+    """
+
+    def chat_model(**kwargs):
+        return StubChatModel(
+            first_token_latency=args.llm_latency, token_latency=args.token_latency
+        )
+
+    shared = args.serving_mode == "shared"
+    embedding_model = StubEmbeddings(dim=args.embedding_dim, latency=args.embed_latency)
+    if args.index_dir:
+        version_path = IndexVersionStore(args.index_dir).current_path()
+        if version_path is None:
+            raise FileNotFoundError(f"No published index found in {args.index_dir}")
+        # Query vectors must match the index dimension
+        embedding_model.dim = index_dimension(version_path, shared)
+        index_dir, temp_dir = args.index_dir, None
+    else:
+        index_dir = temp_dir = tempfile.mkdtemp(prefix="load_test_index_")
+        publish_synthetic_index(embedding_model, index_dir, args.num_docs, shared)
+
+    settings.VECTOR_STORE = "FAISS"
+    settings.INDEX_DIR = index_dir
+    settings.SERVING_MODE = args.serving_mode
+    app.OpenAIEmbeddings = lambda **kwargs: embedding_model
+    app.ChatOpenAI = chat_model
+    graph_router.ChatOpenAI = chat_model
+    app.cl = _ChainlitStub()
+    # Load up front, as a deployed worker would, so the first session isn't timed on it
+    app.get_vector_store()
+    return temp_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Simulate concurrent Chainlit chats against stubbed LLM and embedding backends."
+    )
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--arrival_rate", type=float, default=5.0, help="New sessions per second.")
+    parser.add_argument("--turns", type=int, default=3, help="Questions per session.")
+    parser.add_argument("--think_time", type=float, default=1.0, help="Mean seconds between turns.")
+    parser.add_argument("--metadata_ratio", type=float, default=0.2)
+    parser.add_argument("--llm_latency", type=float, default=0.5, help="Seconds to first token.")
+    parser.add_argument("--token_latency", type=float, default=0.02)
+    parser.add_argument("--embed_latency", type=float, default=0.05)
+    parser.add_argument("--embedding_dim", type=int, default=1536)
+    parser.add_argument("--num_docs", type=int, default=20)
+    parser.add_argument(
+        "--index_dir",
+        type=str,
+        default=None,
+        help="Published index root to serve. Defaults to a synthetic index in a temp dir.",
+    )
+    parser.add_argument(
+        "--serving_mode",
+        choices=["in_process", "shared"],
+        default=settings.SERVING_MODE,
+    )
+    parser.add_argument("--lag_interval", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--records", type=str, default=None, help="Write per-message JSONL here.")
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report here.")
+    args = parser.parse_args()
+
+    temp_dir = install_stubs(args)
+    try:
+        report = asyncio.run(run_load_test(args))
+    finally:
+        app.get_vector_store().stop_watching()
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    logger.info(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import logging
+
+from config import settings
+from data_ingestion.index_versions import IndexVersionStore
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PREVIOUS = "previous"
+
+
+def list_versions(versions: IndexVersionStore):
+    current = versions.current_version()
+    for version in versions.list_versions():
+        try:
+            manifest = versions.read_manifest(version)
+        except (OSError, ValueError):
+            manifest = {}
+        marker = "*" if version == current else " "
+        print(
+            f"{marker} {version}  created={manifest.get('created_at', 'unknown')}  "
+            f"docs={manifest.get('num_docs', '?')}  chunks={manifest.get('num_chunks', '?')}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="List published index versions or roll the served index back."
+    )
+    parser.add_argument("--index_dir", type=str, default=settings.INDEX_DIR)
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--list", action="store_true", help="List versions; * marks the current one.")
+    group.add_argument(
+        "--rollback",
+        nargs="?",
+        const=PREVIOUS,
+        metavar="VERSION",
+        help="Point CURRENT at VERSION, or at the previous version if omitted.",
+    )
+    args = parser.parse_args()
+
+    versions = IndexVersionStore(args.index_dir, keep=settings.INDEX_KEEP_VERSIONS)
+    if args.list:
+        list_versions(versions)
+        return
+
+    try:
+        version = versions.rollback(None if args.rollback == PREVIOUS else args.rollback)
+    except ValueError as e:
+        parser.error(str(e))
+    # Running apps pick the change up on their next reload poll
+    logger.info(f"Serving index version {version} from {args.index_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import json
+import logging
+import os
+
+import faiss
+import numpy as np
+
+from config import settings
+from data_ingestion.index_versions import IndexVersionStore
+from data_ingestion.partitioned_index import PARTITIONS_DIR, PARTITIONS_FILE
+from data_ingestion.vector_handlers import (
+    STORAGE_FILE,
+    VECTORS_FILE,
+    build_quantized_index,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    hits = sum(len(set(f[f >= 0]) & set(t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def evaluate_storage(
+    vectors: np.ndarray, storage: str, k: int, rerank_factor: int, queries: np.ndarray
+) -> dict:
+    """Measure index size and recall@k of `storage` against exact float32 search."""
+    exact, _ = build_quantized_index(vectors, "float32")
+    _, truth = exact.search(queries, k)
+
+    index, used_storage = build_quantized_index(vectors, storage)
+    _, approx = index.search(queries, k)
+
+    n_candidates = min(k * rerank_factor, len(vectors))
+    _, candidates = index.search(queries, n_candidates)
+    reranked = []
+    for query, ids in zip(queries, candidates):
+        ids = ids[ids >= 0]
+        distances = np.sum((vectors[ids] - query) ** 2, axis=1)
+        reranked.append(ids[np.argsort(distances)[:k]])
+
+    float32_bytes = vectors.nbytes
+    index_bytes = index.ntotal * index.sa_code_size()
+    return {
+        "storage": used_storage,
+        "index_mb": index_bytes / 2**20,
+        "saved_mb": (float32_bytes - index_bytes) / 2**20,
+        "recall": recall_at_k(approx, truth),
+        "recall_reranked": recall_at_k(np.array(reranked), truth),
+    }
+
+
+def load_float32_vectors(index_path: str) -> np.ndarray:
+    """Read the exact vectors of a saved index without loading the docstore or embeddings.
+
+    A partitioned index contributes the vectors of all its non-empty partitions.
+    """
+    partitions_path = os.path.join(index_path, PARTITIONS_FILE)
+    if os.path.exists(partitions_path):
+        with open(partitions_path, "r") as f:
+            manifest = json.load(f)
+        return np.concatenate(
+            [
+                load_float32_vectors(os.path.join(index_path, PARTITIONS_DIR, key))
+                for key, info in manifest["partitions"].items()
+                if info["chunks"]
+            ]
+        )
+    storage_path = os.path.join(index_path, STORAGE_FILE)
+    if os.path.exists(storage_path):
+        with open(storage_path, "r") as f:
+            dim = json.load(f)["dim"]
+        return np.fromfile(os.path.join(index_path, VECTORS_FILE), dtype="float32").reshape(-1, dim)
+    index = faiss.read_index(os.path.join(index_path, "index.faiss"))
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report memory saved and recall@k for compressed vector storage modes."
+    )
+    parser.add_argument("--index_path", type=str, default=None)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--rerank_factor", type=int, default=settings.RERANK_FACTOR)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    index_path = args.index_path or IndexVersionStore(settings.INDEX_DIR).current_path()
+    vectors = load_float32_vectors(index_path)
+
+    # Stored chunks plus noise stand in for real questions without calling the embedding API
+    rng = np.random.default_rng(0)
+    sample = vectors[rng.choice(len(vectors), min(args.queries, len(vectors)), replace=False)]
+    queries = (sample + rng.normal(0, sample.std() * 0.5, sample.shape)).astype("float32")
+
+    logger.info(f"{len(vectors)} vectors of dimension {vectors.shape[1]}, recall@{args.k}")
+    for storage in ("float32", "float16", "int8", "pq"):
+        report = evaluate_storage(vectors, storage, args.k, args.rerank_factor, queries)
+        logger.info(
+            f"{report['storage']:>8}: index {report['index_mb']:.1f} MB "
+            f"(saved {report['saved_mb']:.1f} MB), recall {report['recall']:.3f}, "
+            f"with re-ranking {report['recall_reranked']:.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import argparse
+import json
+import logging
+import os
+import time
+
+from dotenv import load_dotenv
+from langchain.chat_models import ChatOpenAI
+from langchain.embeddings import OpenAIEmbeddings
+
+from config import settings
+from data_ingestion.index_versions import IndexVersionStore
+from data_ingestion.partitioned_index import load_faiss_store
+from retrieval.graph_router import RetrievalGraph
+from retrieval.retriever import CustomRetrievalQA
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def read_questions(path: str) -> list:
+    """Read questions from a .jsonl file (``{"question": ...}`` per line) or plain text, one per line."""
+    with open(path, "r") as f:
+        lines = [line.strip() for line in f if line.strip()]
+    if path.endswith(".jsonl"):
+        return [json.loads(line)["question"] for line in lines]
+    return lines
+
+
+def write_results(path: str, results: list):
+    with open(path, "w") as f:
+        for result in results:
+            record = {
+                "question": result["question"],
+                "route": result["route"],
+                "answer": result["answer"],
+                "sources": [
+                    doc.metadata.get("source_chunk") or doc.metadata.get("source")
+                    for doc in result.get("source_documents", [])
+                ],
+            }
+            if result.get("error"):
+                record["error"] = result["error"]
+            f.write(json.dumps(record) + "\n")
+
+
+def build_graph(index_path: str = None) -> RetrievalGraph:
+    if settings.VECTOR_STORE.upper() != "FAISS":
+        raise ValueError(f"Batch QA supports only the FAISS vector store, not {settings.VECTOR_STORE}")
+    index_path = index_path or IndexVersionStore(settings.INDEX_DIR).current_path()
+    if index_path is None:
+        raise FileNotFoundError(f"No published index found in {settings.INDEX_DIR}")
+
+    load_dotenv("src/config/secrets.env", override=True)
+    embedding_model = OpenAIEmbeddings(
+        model="text-embedding-ada-002", openai_api_key=os.getenv("OPENAI_API_KEY")
+    )
+    vector_store = load_faiss_store(
+        index_path,
+        embedding_model,
+        rerank_factor=settings.RERANK_FACTOR,
+    )
+
+    qa_chain = CustomRetrievalQA(
+        llm=ChatOpenAI(temperature=0),
+        vector_store=vector_store,
+        retrieval_method=settings.RETRIEVAL_METHOD,
+        return_source_documents=True,
+    )
+    return RetrievalGraph(retriever_chain=qa_chain)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Answer a batch of questions and write JSONL results.")
+    parser.add_argument("--questions", type=str, required=True)
+    parser.add_argument("--output", type=str, default="answers.jsonl")
+    parser.add_argument("--max_concurrency", type=int, default=8)
+    parser.add_argument("--index_path", type=str, default=None)
+    args = parser.parse_args()
+
+    questions = read_questions(args.questions)
+    graph = build_graph(args.index_path)
+
+    start = time.perf_counter()
+    results = graph.answer_batch(questions, max_concurrency=args.max_concurrency)
+    elapsed = time.perf_counter() - start
+
+    write_results(args.output, results)
+    failed = sum(1 for result in results if result.get("error"))
+    logger.info(
+        f"Answered {len(questions) - failed} of {len(questions)} questions in {elapsed:.1f}s "
+        f"({len(questions) / elapsed:.2f} questions/s), results in {args.output}"
+    )
+    if failed:
+        logger.warning(f"{failed} questions failed; see the 'error' field in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
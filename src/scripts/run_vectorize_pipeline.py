@@ -1,3 +1,4 @@
+import argparse
 import logging
 
 from scripts.steps.download_step import run_download
@@ -8,8 +9,16 @@ logger = logging.getLogger(__name__)
 
 
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from its ingestion checkpoints.",
+    )
+    args = parser.parse_args()
+
     docs_path = run_download()
-    run_load(docs_path)
+    run_load(docs_path, resume=args.resume)
     logger.info("Pipeline completed successfully.")
 
 
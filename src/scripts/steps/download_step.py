@@ -9,7 +9,13 @@ def run_download(url: str = None, output_path: str = None) -> str:
     if output_path is None:
         output_path = settings.DATA_DIR + "transcripts.zip"
 
-    download_zip_if_needed(url, output_path)
+    download_zip_if_needed(
+        url,
+        output_path,
+        part_size=settings.DOWNLOAD_PART_SIZE,
+        max_workers=settings.DOWNLOAD_WORKERS,
+        sha256=settings.TRANSCRIPT_ZIP_SHA256,
+    )
     return output_path
 
 
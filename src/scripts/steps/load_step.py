@@ -1,19 +1,59 @@
 import argparse
 
+from langchain.embeddings import OpenAIEmbeddings
+
 from config import settings
 from data_ingestion.docs_loader import DocsLoader
-from data_ingestion.document_chunker import DocSplitter
+from data_ingestion.document_chunker import DocSplitter, ParentChildSplitter
+from data_ingestion.partitioned_index import PartitionedFAISSAdapter
 from data_ingestion.vector_handlers import AzureSearchAdapter, FAISSAdapter
 
 
-def run_load(input_path: str = settings.DATA_DIR + "transcripts.zip"):
-    text_splitter = DocSplitter()
-    if settings.VECTOR_STORE == "FAISS":
-        vector_store = FAISSAdapter()
-    elif settings.VECTOR_STORE == "AZURE_SEARCH":
-        vector_store = AzureSearchAdapter()
-    docs_loader = DocsLoader(text_splitter=text_splitter, vector_store=vector_store)
-    docs_loader.load_and_embed_zip(input_path)
+def run_load(
+    input_path: str = settings.DATA_DIR + "transcripts.zip", resume: bool = False
+):
+    if settings.CHUNKING == "parent_child" and settings.VECTOR_STORE != "FAISS":
+        raise ValueError("Parent-child chunking is only supported with the FAISS store.")
+    if settings.CHUNKING == "parent_child":
+        text_splitter = ParentChildSplitter(
+            parent_chunk_size=settings.PARENT_CHUNK_SIZE,
+            child_chunk_size=settings.CHILD_CHUNK_SIZE,
+            child_chunk_overlap=settings.CHILD_CHUNK_OVERLAP,
+        )
+    else:
+        text_splitter = DocSplitter()
+    if settings.VECTOR_STORE == "FAISS" and settings.INDEX_PARTITIONING == "fiscal_period":
+        if settings.SERVING_MODE == "shared":
+            raise ValueError("Shared serving does not support a partitioned index.")
+        vector_store = PartitionedFAISSAdapter(
+            storage=settings.VECTOR_STORAGE, rerank_factor=settings.RERANK_FACTOR
+        )
+    elif settings.VECTOR_STORE == "FAISS":
+        vector_store = FAISSAdapter(
+            storage=settings.VECTOR_STORAGE, rerank_factor=settings.RERANK_FACTOR
+        )
+    elif settings.VECTOR_STORE in ("AZURE", "AZURE_SEARCH"):
+        vector_store = AzureSearchAdapter.from_env(
+            OpenAIEmbeddings(model="text-embedding-ada-002"),
+            batch_size=settings.AZURE_UPLOAD_BATCH_SIZE,
+            max_workers=settings.AZURE_UPLOAD_WORKERS,
+        )
+    else:
+        raise ValueError(f"Invalid vector store: {settings.VECTOR_STORE}")
+    docs_loader = DocsLoader(
+        text_splitter=text_splitter,
+        vector_store=vector_store,
+        conversion_cache_dir=settings.CONVERSION_CACHE_DIR,
+    )
+    docs_loader.load_and_embed_zip(
+        input_path,
+        index_path=settings.INDEX_DIR,
+        keep_versions=settings.INDEX_KEEP_VERSIONS,
+        export_shared=settings.SERVING_MODE == "shared",
+        journal_dir=settings.JOURNAL_DIR,
+        resume=resume,
+        embed_batch_size=settings.EMBED_BATCH_SIZE,
+    )
 
 
 # def main():
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from data_ingestion.fiscal_periods import (
+    extract_fiscal_period,
+    matching_periods,
+    parse_period_references,
+)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Q2 FY25 earnings call", {(2025, 2)}),
+        ("Q2'25 results", {(2025, 2)}),
+        ("Q2 2025 results", {(2025, 2)}),
+        ("Q2-2025 results", {(2025, 2)}),
+        ("Q2 25 customers", set()),
+        ("Top 10 customers in Q3 10 of them churned", set()),
+        ("second quarter of fiscal 2025", {(2025, 2)}),
+        ("FY2025 second quarter", {(2025, 2)}),
+        ("fiscal 2024 Q4", {(2024, 4)}),
+        ("Q1 and Q2 FY25", {(2025, 1), (2025, 2)}),
+        ("guidance for fiscal 2026", {(2026, None)}),
+        ("Q2 25% growth", set()),
+        ("Q2 2.5 million units", set()),
+        ("revenue in 2024", set()),
+        ("Q3 was strong in FY24 and FY25", {(2024, None), (2025, None)}),
+    ],
+)
+def test_parse_period_references(text, expected):
+    assert parse_period_references(text) == expected
+
+
+@pytest.mark.parametrize(
+    "filename, expected",
+    [
+        ("AAPL-2025-Q2.pdf", "FY2025-Q2"),
+        ("MSFT_2024Q4.pdf", "FY2024-Q4"),
+        ("NVDA_Q1_FY26.pdf", "FY2026-Q1"),
+        ("AMZN Q3-2024 transcript.pdf", "FY2024-Q3"),
+        ("AAPL_Q1_FY25_vs_Q4_FY24.pdf", "FY2025-Q1"),
+        ("earnings_call_001.pdf", None),
+    ],
+)
+def test_extract_fiscal_period_from_filename(filename, expected):
+    assert extract_fiscal_period(filename) == expected
+
+
+def test_extract_fiscal_period_prefers_the_title_line():
+    content = "Third Quarter Fiscal 2024 Earnings Call\nWe expect Q4 FY24 revenue of $2B."
+    assert extract_fiscal_period("call.pdf", content) == "FY2024-Q3"
+    # The quarter named first on the line is the transcript's, not the earliest one
+    content = "Q1 FY2025 Earnings Call, compared with Q4 FY2024"
+    assert extract_fiscal_period("call.pdf", content) == "FY2025-Q1"
+    # A bare year before a quarter only counts in filenames
+    assert extract_fiscal_period("call.pdf", "In 2024 Q1 was weak.") is None
+    assert extract_fiscal_period("call.pdf", "Fiscal 2025 annual report") == "FY2025"
+
+
+def test_matching_periods():
+    keys = ["FY2025-Q1", "FY2025-Q2", "FY2024-Q4", "unknown"]
+    assert matching_periods({(2025, None)}, keys) == ["FY2025-Q1", "FY2025-Q2"]
+    assert matching_periods({(2024, 4)}, keys) == ["FY2024-Q4"]
+    assert matching_periods({(2023, 1)}, keys) == []
+
+
+def test_report_reads_partitioned_vectors(tmp_path):
+    from langchain_core.documents import Document
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+
+    from data_ingestion.partitioned_index import PartitionedFAISSAdapter
+    from scripts.report_vector_storage import load_float32_vectors
+
+    adapter = PartitionedFAISSAdapter(embedding_model=DeterministicFakeEmbedding(size=16))
+    adapter.add_documents(
+        [
+            Document(
+                page_content=f"chunk {i}",
+                metadata={"source_chunk": f"call{i % 3}.pdf/{i}", "fiscal_period": period},
+            )
+            for i, period in enumerate(["FY2025-Q1", "FY2025-Q2", None] * 4)
+        ]
+    )
+    adapter.save(str(tmp_path))
+
+    vectors = load_float32_vectors(str(tmp_path))
+
+    assert vectors.shape == (12, 16)
+    expected = np.concatenate(
+        [p.index.index.reconstruct_n(0, p.index.index.ntotal) for p in adapter.partitions.values()]
+    )
+    assert np.allclose(np.sort(vectors, axis=0), np.sort(expected, axis=0))
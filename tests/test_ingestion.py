@@ -0,0 +1,645 @@
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import urlparse
+
+import pytest
+import requests
+
+from data_ingestion.download_data import download_zip_if_needed, is_valid_zip
+
+PART_SIZE = 64 * 1024
+
+
+def make_zip(num_files: int = 8) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+        for i in range(num_files):
+            archive.writestr(f"call{i}.pdf", os.urandom(PART_SIZE))
+    return buffer.getvalue()
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Serves `server.payload` with byte ranges; parts starting in `server.fail_starts` get a 500.
+
+    HEAD requests are answered with `server.head_status` when set.
+    """
+
+    def log_message(self, *args):
+        pass
+
+    def _headers(self, status: int, length: int, extra=None):
+        self.send_response(status)
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", f'"{hashlib.md5(self.server.payload).hexdigest()}"')
+        for key, value in (extra or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+
+    def do_HEAD(self):
+        if self.server.head_status:
+            self.send_response(self.server.head_status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._headers(200, len(self.server.payload))
+
+    def do_GET(self):
+        payload = self.server.payload
+        range_header = self.headers.get("Range")
+        if not range_header:
+            self._headers(200, len(payload))
+            self.wfile.write(payload)
+            return
+        start, end = (int(x) for x in range_header.split("=")[1].split("-"))
+        with self.server.lock:
+            self.server.requested.append(start)
+        if start in self.server.fail_starts:
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = payload[start : end + 1]
+        self._headers(206, len(body), {"Content-Range": f"bytes {start}-{end}/{len(payload)}"})
+        self.wfile.write(body)
+
+
+def serve(handler, **attributes):
+    """Run `handler` on a local port in a background thread; `attributes` are set on the server."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.lock = threading.Lock()
+    for name, value in attributes.items():
+        setattr(server, name, value)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def range_server():
+    yield from serve(
+        RangeHandler, payload=make_zip(), fail_starts=set(), head_status=None, requested=[]
+    )
+
+
+def url_of(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}/transcripts.zip"
+
+
+def test_download_resumes_after_failed_part(range_server, tmp_path):
+    save_path = str(tmp_path / "transcripts.zip")
+    failing_start = 3 * PART_SIZE
+    range_server.fail_starts = {failing_start}
+
+    with pytest.raises(requests.RequestException):
+        download_zip_if_needed(
+            url_of(range_server), save_path, part_size=PART_SIZE, max_workers=2
+        )
+    with open(save_path + ".part.json") as f:
+        done = json.load(f)["done"]
+    # Parts that finished after the failure are kept, not just those before it
+    assert any(i > 3 for i in done)
+    assert 3 not in done
+
+    range_server.fail_starts = set()
+    range_server.requested = []
+    download_zip_if_needed(url_of(range_server), save_path, part_size=PART_SIZE, max_workers=2)
+
+    assert set(range_server.requested).isdisjoint(i * PART_SIZE for i in done)
+    assert failing_start in range_server.requested
+    with open(save_path, "rb") as f:
+        assert f.read() == range_server.payload
+    assert not os.path.exists(save_path + ".part")
+    assert not os.path.exists(save_path + ".part.json")
+
+
+def test_truncated_cached_zip_is_downloaded_again(range_server, tmp_path):
+    save_path = str(tmp_path / "transcripts.zip")
+    with open(save_path, "wb") as f:
+        f.write(range_server.payload[: len(range_server.payload) // 2])
+    assert not is_valid_zip(save_path)
+
+    download_zip_if_needed(url_of(range_server), save_path, part_size=PART_SIZE)
+
+    assert range_server.requested
+    with open(save_path, "rb") as f:
+        assert f.read() == range_server.payload
+
+
+def test_valid_cached_zip_is_reused(range_server, tmp_path):
+    save_path = str(tmp_path / "transcripts.zip")
+    with open(save_path, "wb") as f:
+        f.write(range_server.payload)
+
+    download_zip_if_needed(
+        url_of(range_server),
+        save_path,
+        sha256=hashlib.sha256(range_server.payload).hexdigest(),
+    )
+
+    assert range_server.requested == []
+
+
+@pytest.mark.parametrize("status", [403, 405])
+def test_download_streams_when_head_is_rejected(range_server, tmp_path, status):
+    range_server.head_status = status
+    save_path = str(tmp_path / "transcripts.zip")
+
+    download_zip_if_needed(url_of(range_server), save_path=save_path, part_size=PART_SIZE)
+
+    assert range_server.requested == []
+    with open(save_path, "rb") as f:
+        assert f.read() == range_server.payload
+
+
+def test_rollback_follows_publish_order(tmp_path):
+    from data_ingestion.index_versions import IndexVersionStore
+
+    versions = IndexVersionStore(str(tmp_path / "index"), keep=5)
+    published = []
+    for i in range(3):
+        version_dir = versions.new_version_dir()
+        versions.publish(version_dir, {"num_docs": i})
+        published.append(os.path.basename(version_dir))
+
+    assert versions.list_versions() == published
+    assert versions.rollback() == published[1]
+    assert versions.rollback() == published[0]
+    with pytest.raises(ValueError):
+        versions.rollback()
+    assert versions.rollback(published[2]) == published[2]
+
+
+def test_publish_prunes_to_keep_previous_versions(tmp_path):
+    from data_ingestion.index_versions import IndexVersionStore
+
+    versions = IndexVersionStore(str(tmp_path / "index"), keep=2)
+    published = []
+    for i in range(5):
+        version_dir = versions.new_version_dir()
+        versions.publish(version_dir, {"num_docs": i})
+        published.append(os.path.basename(version_dir))
+
+    # The current version plus `keep` previous ones
+    assert versions.list_versions() == published[2:]
+    assert versions.current_version() == published[-1]
+    assert versions.read_manifest(published[-1])["previous_version"] == published[-2]
+
+
+def test_reloadable_store_swaps_versions_and_survives_bad_ones(tmp_path):
+    import time
+
+    from data_ingestion.index_versions import IndexVersionStore, ReloadableVectorStore
+
+    versions = IndexVersionStore(str(tmp_path / "index"))
+    broken = set()
+
+    def load_adapter(path):
+        if path in broken:
+            raise ValueError(f"corrupt index at {path}")
+        return SimpleNamespace(path=path)
+
+    def publish():
+        version_dir = versions.new_version_dir()
+        versions.publish(version_dir, {})
+        return version_dir
+
+    first = publish()
+    store = ReloadableVectorStore(versions, load_adapter, poll_interval=0.01)
+    assert store.path == first
+    assert store.reload_if_changed() is False
+
+    second = publish()
+    assert store.reload_if_changed() is True
+    assert store.path == store.current_path == second
+
+    third = publish()
+    broken.add(third)
+    with pytest.raises(ValueError):
+        store.reload_if_changed()
+    assert store.path == store.current_path == second
+
+    # The watcher keeps serving the old version and retries until the new one loads
+    store.start_watching()
+    try:
+        time.sleep(0.05)
+        assert store.path == second
+        broken.clear()
+        deadline = time.monotonic() + 5
+        while store.path != third and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert store.path == third
+    finally:
+        store.stop_watching()
+
+
+def test_compressed_index_saves_completely_to_every_path(tmp_path):
+    from langchain_core.documents import Document
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+
+    from data_ingestion.vector_handlers import FAISSAdapter
+
+    embeddings = DeterministicFakeEmbedding(size=32)
+    adapter = FAISSAdapter(embedding_model=embeddings, storage="int8")
+    adapter.add_documents(
+        [Document(page_content=f"chunk {i}", metadata={"source_chunk": f"doc/{i}"}) for i in range(50)]
+    )
+    expected = [d.metadata["source_chunk"] for d in adapter.similarity_search("chunk 7", k=4)]
+
+    for name in ("first", "second"):
+        adapter.save(str(tmp_path / name))
+    # Saving doesn't quantize or re-home the adapter itself
+    assert adapter._vectors is None
+
+    for name in ("first", "second"):
+        loaded = FAISSAdapter(embedding_model=embeddings)
+        loaded.load(str(tmp_path / name))
+        assert loaded.storage == "int8"
+        assert [d.metadata["source_chunk"] for d in loaded.similarity_search("chunk 7", k=4)] == expected
+
+
+SEARCH_IN = re.compile(r"search\.in\(source_chunk, '((?:[^']|'')*)', '\|'\)")
+
+
+class AzureSearchHandler(BaseHTTPRequestHandler):
+    """Stand-in for the Azure AI Search docs REST API (`docs/index` and filter `docs/search`).
+
+    `server.scripted` holds (status, headers) responses returned before any real handling;
+    keys in `server.throttled_keys` fail once with a per-document 429 in a 207 response.
+    """
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, body: dict, headers=None):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        path = urlparse(self.path).path
+        with self.server.lock:
+            self.server.requests.append((path, body))
+            scripted = self.server.scripted.pop(0) if self.server.scripted else None
+        if scripted:
+            status, headers = scripted
+            self._reply(status, {}, headers)
+        elif path.endswith("/docs/index"):
+            self._index(body["value"])
+        elif path.endswith("/docs/search"):
+            self._search(body)
+        else:
+            self._reply(404, {})
+
+    def _index(self, actions):
+        from data_ingestion.vector_handlers import FIELDS_ID
+
+        results = []
+        for action in actions:
+            key = action[FIELDS_ID]
+            if key in self.server.throttled_keys:
+                self.server.throttled_keys.discard(key)
+                results.append({"key": key, "status": False, "statusCode": 429})
+                continue
+            self.server.documents[key] = action
+            results.append({"key": key, "status": True, "statusCode": 200})
+        failed = any(not r["status"] for r in results)
+        self._reply(207 if failed else 200, {"value": results})
+
+    def _search(self, body):
+        match = SEARCH_IN.fullmatch(body.get("filter", ""))
+        if not match:
+            self._reply(400, {"error": {"message": f"Invalid filter: {body.get('filter')}"}})
+            return
+        wanted = set(match.group(1).replace("''", "'").split("|"))
+        fields = body["select"].split(",")
+        hits = [
+            {field: doc.get(field) for field in fields}
+            for doc in self.server.documents.values()
+            if doc.get("source_chunk") in wanted
+        ]
+        # Result order carries no meaning; make sure callers don't rely on it
+        self._reply(200, {"value": hits[::-1][: body["top"]]})
+
+
+@pytest.fixture
+def azure_server():
+    yield from serve(
+        AzureSearchHandler, documents={}, scripted=[], throttled_keys=set(), requests=[]
+    )
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    from data_ingestion import azure_search_client
+
+    delays = []
+    monkeypatch.setattr(azure_search_client, "time", SimpleNamespace(sleep=delays.append))
+    return delays
+
+
+def azure_client(server):
+    from data_ingestion.azure_search_client import AzureSearchRestClient
+    from data_ingestion.vector_handlers import FIELDS_ID
+
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+    return AzureSearchRestClient(endpoint, "test-key", "transcripts", key_field=FIELDS_ID)
+
+
+def indexed_paths(server):
+    return [path for path, _ in server.requests if path.endswith("/docs/index")]
+
+
+def test_azure_retries_throttled_requests_after_retry_after(azure_server, sleeps):
+    azure_server.scripted = [(503, {"Retry-After": "2"})]
+    client = azure_client(azure_server)
+
+    client.index_documents([{client.key_field: "a", "source_chunk": "call.pdf/0"}])
+
+    assert sleeps == [2.0]
+    assert len(indexed_paths(azure_server)) == 2
+    assert list(azure_server.documents) == ["a"]
+
+
+def test_azure_resends_only_failed_documents(azure_server, sleeps):
+    azure_server.throttled_keys = {"b"}
+    client = azure_client(azure_server)
+
+    client.index_documents([{client.key_field: key} for key in ("a", "b", "c")])
+
+    _, retry = azure_server.requests[-1]
+    assert len(indexed_paths(azure_server)) == 2
+    assert [doc[client.key_field] for doc in retry["value"]] == ["b"]
+    assert sorted(azure_server.documents) == ["a", "b", "c"]
+
+
+def test_azure_neighbors_escape_quotes_and_keep_order(azure_server, sleeps):
+    from langchain_core.documents import Document
+
+    from data_ingestion.vector_handlers import AzureSearchAdapter
+
+    chunks = [f"o'brien.pdf/{i}" for i in range(7)] + [f"call.pdf/{i}" for i in range(3)]
+    docs = [Document(page_content=ref, metadata={"source_chunk": ref}) for ref in chunks]
+    by_ref = {doc.metadata["source_chunk"]: doc for doc in docs}
+    hits = [by_ref["o'brien.pdf/3"], by_ref["call.pdf/0"], by_ref["o'brien.pdf/4"]]
+
+    def similarity_search_with_score(query, k):
+        return [(Document(page_content=d.page_content, metadata=dict(d.metadata)), 0.0) for d in hits]
+
+    # Vector search itself goes through LangChain's AzureSearch; only the REST calls are under test
+    store = SimpleNamespace(similarity_search_with_score=similarity_search_with_score)
+    adapter = AzureSearchAdapter(store, rest_client=azure_client(azure_server), batch_size=4)
+    adapter.add_embeddings(docs, [[0.0, 1.0]] * len(docs))
+
+    results = adapter.similarity_search_with_neighbors("growth", k=3, window=1)
+
+    assert [doc.page_content for doc in results] == [
+        "o'brien.pdf/2",
+        "o'brien.pdf/3",
+        "o'brien.pdf/4",
+        "call.pdf/0",
+        "call.pdf/1",
+        "o'brien.pdf/5",
+    ]
+    searches = [body for path, body in azure_server.requests if path.endswith("/docs/search")]
+    assert len(searches) == 1
+    assert "o''brien.pdf/2" in searches[0]["filter"]
+
+
+def test_journal_resume_drops_uncommitted_vectors(tmp_path, monkeypatch):
+    from langchain_core.documents import Document
+
+    from data_ingestion import ingestion_journal
+    from data_ingestion.ingestion_journal import VECTOR_IDS_FILE, IngestionJournal
+
+    path = str(tmp_path / "journal")
+    fingerprint = {"zip_sha256": "abc"}
+    vectors = {f"c{i}": [float(i)] * 4 for i in range(6)}
+    append_durably = ingestion_journal._append_durably
+
+    def crash_before_commit(file_path, data):
+        if file_path.endswith(VECTOR_IDS_FILE):
+            raise RuntimeError("killed")
+        append_durably(file_path, data)
+
+    # Crash after the first batch's vectors are written but before its ids commit them
+    journal = IngestionJournal(path, fingerprint)
+    journal.open()
+    journal.record_document(
+        Document(page_content="call", metadata={"source_path": "call.pdf", "doc_hash": "h"})
+    )
+    monkeypatch.setattr(ingestion_journal, "_append_durably", crash_before_commit)
+    with pytest.raises(RuntimeError):
+        journal.record_vectors(["c4", "c5"], [vectors["c4"], vectors["c5"]])
+    monkeypatch.setattr(ingestion_journal, "_append_durably", append_durably)
+
+    journal = IngestionJournal(path, fingerprint)
+    journal.open(resume=True)
+    assert journal.completed_document("call.pdf", "h").page_content == "call"
+    assert not journal.has_vector("c4")
+    for batch in (["c0", "c1"], ["c2", "c3"]):
+        journal.record_vectors(batch, [vectors[c] for c in batch])
+    # Torn write of the next batch: vector bytes and half an ids line
+    with open(tmp_path / "journal" / "vectors.f32", "ab") as f:
+        f.write(b"\0" * 32)
+    with open(tmp_path / "journal" / VECTOR_IDS_FILE, "ab") as f:
+        f.write(b'{"ids": ["c4"')
+
+    journal = IngestionJournal(path, fingerprint)
+    journal.open(resume=True)
+    ids = ["c0", "c1", "c2", "c3"]
+    assert journal.vectors_for(ids).tolist() == [vectors[c] for c in ids]
+    assert not journal.has_vector("c4")
+
+    # A different input invalidates the journal
+    journal = IngestionJournal(path, {"zip_sha256": "def"})
+    journal.open(resume=True)
+    assert not journal.has_vector("c0")
+    assert journal.completed_document("call.pdf", "h") is None
+
+
+def transcript(paragraphs: int = 12, words: int = 300) -> str:
+    speech = "\n\n".join(" ".join([f"p{i}"] * words) for i in range(paragraphs))
+    return (
+        "# Q2 FY25 Earnings Call\n**Operator**\nWelcome to the call.\n"
+        f"**Tim Cook** -- CEO\n\n{speech}\n**Analyst**\nThanks."
+    )
+
+
+def test_parent_child_split_keeps_speakers_with_continuations():
+    from data_ingestion.document_chunker import ParentChildSplitter
+
+    splitter = ParentChildSplitter(parent_chunk_size=4000, child_chunk_size=400, child_chunk_overlap=50)
+    pairs = splitter.split_parent_child(transcript())
+    parents = [parent for parent, _ in pairs]
+
+    assert len(parents) > 2
+    assert all(len(parent) <= 4000 for parent in parents)
+    # The title and the short operator turn are merged with the start of the next turn
+    assert parents[0].startswith("# Q2 FY25 Earnings Call\n**Operator**\nWelcome to the call.\n**Tim Cook**")
+    # Continuations of the long turn stay attributed to its speaker
+    assert all(parent.startswith("**Tim Cook** -- CEO\n\np") for parent in parents[1:])
+    assert parents[-1].endswith("**Analyst**\nThanks.")
+    for parent, children in pairs:
+        assert children and all(child in parent and len(child) <= 400 for child in children)
+    assert splitter.split_text(transcript()) == [c for _, children in pairs for c in children]
+
+
+def test_select_parents_dedupes_in_rank_order():
+    from langchain_core.documents import Document
+
+    from data_ingestion.vector_handlers import select_parents
+
+    parents = {f"p{i}": Document(page_content=f"parent {i}", metadata={"source_chunk": f"p{i}"}) for i in range(3)}
+
+    def child(ref, parent_id=None):
+        return Document(page_content=ref, metadata={"source_chunk": ref, "parent_id": parent_id})
+
+    hits = [
+        (child("c1", "p1"), 0.1),
+        (child("c2", "p1"), 0.2),
+        (child("orphan"), 0.3),
+        (child("c3", "missing"), 0.4),
+        (child("c0", "p0"), 0.5),
+        (child("c4", "p2"), 0.6),
+    ]
+
+    results = select_parents(hits, parents, k=4)
+
+    assert [doc.page_content for doc in results] == ["parent 1", "orphan", "c3", "parent 0"]
+    assert all(doc.metadata["source"] for doc in results)
+
+
+def test_parents_round_trip_through_save(tmp_path):
+    from langchain_core.documents import Document
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+
+    from data_ingestion.vector_handlers import PARENTS_FILE, FAISSAdapter
+
+    embeddings = DeterministicFakeEmbedding(size=16)
+    adapter = FAISSAdapter(embedding_model=embeddings)
+    adapter.add_documents(
+        [
+            Document(
+                page_content=f"child {i}",
+                metadata={"source_chunk": f"call.pdf/{i}", "parent_id": f"call.pdf/p{i // 3}"},
+            )
+            for i in range(9)
+        ]
+    )
+    adapter.add_parent_documents(
+        [
+            Document(page_content=f"parent {p}", metadata={"source_chunk": f"call.pdf/p{p}"})
+            for p in range(3)
+        ]
+    )
+    adapter.save(str(tmp_path))
+
+    loaded = FAISSAdapter(embedding_model=embeddings)
+    loaded.load(str(tmp_path))
+
+    assert (tmp_path / PARENTS_FILE).exists()
+    assert {k: (p.page_content, p.metadata) for k, p in loaded.parents.items()} == {
+        k: (p.page_content, p.metadata) for k, p in adapter.parents.items()
+    }
+    expected = adapter.similarity_search_with_parents("child 4", k=2)
+    assert [d.page_content for d in loaded.similarity_search_with_parents("child 4", k=2)] == [
+        d.page_content for d in expected
+    ]
+
+
+def test_shared_index_matches_in_process_adapter(tmp_path):
+    import random
+
+    from langchain_core.documents import Document
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+
+    from data_ingestion.shared_index import SharedFAISSAdapter, export_shared_index
+    from data_ingestion.vector_handlers import FAISSAdapter
+
+    embeddings = DeterministicFakeEmbedding(size=16)
+    # 12 chunks per call, so sorting chunk indexes as text ("10" < "2") would break adjacency
+    children = [
+        Document(
+            page_content=f"call {src} chunk {i}",
+            metadata={
+                "source_doc": f"call{src}.pdf",
+                "source_chunk": f"call{src}.pdf/{i}",
+                "parent_id": f"call{src}.pdf/p{i // 4}",
+            },
+        )
+        for src in range(3)
+        for i in range(12)
+    ]
+    random.Random(0).shuffle(children)
+    adapter = FAISSAdapter(embedding_model=embeddings)
+    adapter.add_documents(children)
+    adapter.add_parent_documents(
+        [
+            Document(page_content=f"call {src} part {p}", metadata={"source_chunk": f"call{src}.pdf/p{p}"})
+            for src in range(3)
+            for p in range(3)
+        ]
+    )
+    export_shared_index(adapter, str(tmp_path))
+    shared = SharedFAISSAdapter(embedding_model=embeddings)
+    shared.load(str(tmp_path))
+
+    def contents(docs):
+        return [doc.page_content for doc in docs]
+
+    queries = [f"call {src} chunk {i}" for src, i in [(0, 0), (1, 5), (2, 11), (1, 9)]]
+    for query in queries:
+        expected = contents(adapter.similarity_search_with_neighbors(query, k=3, window=1))
+        assert contents(shared.similarity_search_with_neighbors(query, k=3, window=1)) == expected
+        expected = contents(adapter.similarity_search_with_parents(query, k=2))
+        assert contents(shared.similarity_search_with_parents(query, k=2)) == expected
+    assert [contents(docs) for docs in shared.batch_similarity_search_with_neighbors(queries, k=3)] == [
+        contents(docs) for docs in adapter.batch_similarity_search_with_neighbors(queries, k=3)
+    ]
+    assert [contents(docs) for docs in shared.batch_similarity_search_with_parents(queries, k=2)] == [
+        contents(docs) for docs in adapter.batch_similarity_search_with_parents(queries, k=2)
+    ]
+
+
+def test_pq_fallback_records_the_storage_used(tmp_path):
+    import faiss
+    from langchain_core.documents import Document
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+
+    from data_ingestion.vector_handlers import STORAGE_FILE, FAISSAdapter
+
+    embeddings = DeterministicFakeEmbedding(size=32)
+    # Too few vectors to train PQ
+    adapter = FAISSAdapter(embedding_model=embeddings, storage="pq")
+    adapter.add_documents([Document(page_content=f"chunk {i}") for i in range(50)])
+
+    adapter.save(str(tmp_path))
+    assert json.loads((tmp_path / STORAGE_FILE).read_text())["storage"] == "int8"
+    assert adapter.memory_usage()["storage"] == "float32"
+
+    loaded = FAISSAdapter(embedding_model=embeddings)
+    loaded.load(str(tmp_path))
+    assert loaded.storage == "int8"
+    assert isinstance(loaded.index.index, faiss.IndexScalarQuantizer)
+
+    adapter.compress()
+    assert adapter.memory_usage()["storage"] == "int8"
+    assert isinstance(adapter.index.index, faiss.IndexScalarQuantizer)
@@ -0,0 +1,77 @@
+import pytest
+
+from data_ingestion import loaders
+from data_ingestion.loaders import ConversionCache, EnhancedPDFLoader
+
+
+@pytest.fixture
+def converter(monkeypatch):
+    """Fake pymupdf4llm/pandoc conversion that counts its calls."""
+    calls = {"to_markdown": 0, "convert_text": 0}
+
+    def to_markdown(path, **kwargs):
+        calls["to_markdown"] += 1
+        return f"# Converted {calls['to_markdown']}"
+
+    def convert_text(text, to, format):
+        calls["convert_text"] += 1
+        return text
+
+    monkeypatch.setattr(loaders.pymupdf4llm, "to_markdown", to_markdown)
+    monkeypatch.setattr(loaders.pymupdf4llm, "__version__", "1.0")
+    monkeypatch.setattr(loaders.pypandoc, "convert_text", convert_text)
+    monkeypatch.setattr(loaders.pypandoc, "get_pandoc_version", lambda: "3.1")
+    monkeypatch.setattr(loaders, "get_page_count", lambda path: 7)
+    return calls
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "call.pdf"
+    path.write_bytes(b"%PDF-1.4 not really a pdf")
+    return str(path)
+
+
+def load(pdf_path, cache, **kwargs):
+    return EnhancedPDFLoader(pdf_path, convert_to_md=True, cache=cache, **kwargs).load()[0]
+
+
+def test_cache_hit_skips_conversion(converter, pdf_path, tmp_path):
+    cache = ConversionCache(str(tmp_path / "cache"))
+
+    first = load(pdf_path, cache)
+    second = load(pdf_path, ConversionCache(str(tmp_path / "cache")))
+
+    assert converter == {"to_markdown": 1, "convert_text": 1}
+    assert second.page_content == first.page_content == "# Converted 1"
+    assert second.metadata == {"converted_to": "markdown", "num_pages": 7}
+
+
+def test_changed_settings_or_versions_miss(converter, pdf_path, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    load(pdf_path, ConversionCache(cache_dir))
+
+    load(pdf_path, ConversionCache(cache_dir), extract_images=True)
+    assert converter["to_markdown"] == 2
+
+    monkeypatch.setattr(loaders.pymupdf4llm, "__version__", "2.0")
+    assert load(pdf_path, ConversionCache(cache_dir)).page_content == "# Converted 3"
+
+    monkeypatch.setattr(loaders.pypandoc, "get_pandoc_version", lambda: "3.2")
+    load(pdf_path, ConversionCache(cache_dir))
+    assert converter["convert_text"] == 4
+
+
+def test_corrupt_entry_falls_back_to_conversion(converter, pdf_path, tmp_path):
+    cache = ConversionCache(str(tmp_path / "cache"))
+    load(pdf_path, cache)
+    (entry,) = (tmp_path / "cache").iterdir()
+    entry.write_bytes(entry.read_bytes()[:10])
+
+    doc = load(pdf_path, cache)
+
+    assert converter["to_markdown"] == 2
+    assert doc.page_content == "# Converted 2"
+    # The entry is rewritten and serves the next load
+    assert load(pdf_path, cache).page_content == "# Converted 2"
+    assert converter["to_markdown"] == 2
@@ -0,0 +1,153 @@
+import asyncio
+import random
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from data_ingestion.vector_handlers import FAISSAdapter
+from retrieval import graph_router
+from retrieval.graph_router import RetrievalGraph
+from retrieval.retriever import SourcesStripper, CustomRetrievalQA, strip_sources
+
+ROUTER_MARKER = "Only answer with 'metadata_tool_node' or 'default_retriever'."
+ANSWER = "Revenue grew 10% year over year.\nSOURCES: call.pdf/1"
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Routes "how many" questions to the metadata tool and fails on FAIL markers."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def _reply(self, messages) -> str:
+        prompt = "\n".join(str(m.content) for m in messages)
+        if ROUTER_MARKER in prompt:
+            if "ROUTE_FAIL" in prompt:
+                raise RuntimeError("router rate limited")
+            question = prompt.split("Question:")[-1]
+            return "metadata_tool_node" if "how many" in question.lower() else "default_retriever"
+        if "ANSWER_FAIL" in prompt:
+            raise RuntimeError("answer rate limited")
+        return ANSWER
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._reply(messages)))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        text = self._reply(messages)
+        for i in range(0, len(text), 3):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=text[i : i + 3]))
+
+
+@pytest.fixture
+def vector_store():
+    store = FAISSAdapter(embedding_model=DeterministicFakeEmbedding(size=16))
+    store.add_documents(
+        [
+            Document(
+                page_content=f"chunk {i} of the call",
+                metadata={"source_doc": "call.pdf", "source_chunk": f"call.pdf/{i}"},
+            )
+            for i in range(12)
+        ]
+    )
+    return store
+
+
+@pytest.fixture
+def graph(vector_store, monkeypatch):
+    monkeypatch.setattr(graph_router, "ChatOpenAI", lambda **kwargs: ScriptedChatModel())
+    qa_chain = CustomRetrievalQA(
+        llm=ScriptedChatModel(), vector_store=vector_store, retrieval_method="with_neighbors"
+    )
+    return RetrievalGraph(retriever_chain=qa_chain)
+
+
+def test_answer_batch_reports_failures_per_question(graph):
+    questions = [
+        "What was revenue growth?",
+        "ANSWER_FAIL what was margin?",
+        "ROUTE_FAIL what was guidance?",
+        "How many documents are indexed?",
+        "What was revenue growth?",
+    ]
+
+    results = graph.answer_batch(questions, max_concurrency=2)
+
+    assert [r["question"] for r in results] == questions
+    assert results[0]["answer"] == "Revenue grew 10% year over year."
+    assert results[0]["source_documents"]
+    assert results[1]["answer"] is None and "answer rate limited" in results[1]["error"]
+    assert results[2]["route"] is None and "router rate limited" in results[2]["error"]
+    assert results[3]["route"] == "metadata_tool_node" and "error" not in results[3]
+    assert results[4]["answer"] == results[0]["answer"]
+
+
+def test_answer_batch_drops_duplicate_contexts():
+    boilerplate = "This call contains forward-looking statements."
+    texts = {
+        "call.pdf/0": boilerplate,
+        "other.pdf/0": f"  {boilerplate}\n",
+        "call.pdf/1": "Revenue grew 10% in Q2.",
+        "other.pdf/1": "Revenue grew 10% in Q2. Margin was flat.",
+    }
+    store = FAISSAdapter(embedding_model=DeterministicFakeEmbedding(size=16))
+    store.add_documents(
+        [
+            Document(page_content=text, metadata={"source": ref, "source_chunk": ref})
+            for ref, text in texts.items()
+        ]
+    )
+    qa_chain = CustomRetrievalQA(llm=ScriptedChatModel(), vector_store=store)
+
+    docs = qa_chain.answer_batch(["What was revenue growth?"])[0]["source_documents"]
+
+    contents = sorted(" ".join(doc.page_content.split()) for doc in docs)
+    assert contents == sorted([boilerplate, texts["other.pdf/1"]])
+
+
+def test_batch_qa_requires_published_index(tmp_path, monkeypatch):
+    from config import settings
+    from scripts import run_batch_qa
+
+    monkeypatch.setattr(settings, "INDEX_DIR", str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        run_batch_qa.build_graph()
+
+
+def stream(graph, question):
+    async def collect():
+        return [event async for event in graph.astream_answer(question)]
+
+    return asyncio.run(collect())
+
+
+@pytest.mark.parametrize("question", ["What was revenue growth?", "How many documents are indexed?"])
+def test_streamed_tokens_match_invoke(graph, question):
+    events = stream(graph, question)
+    tokens = [event["token"] for event in events[:-1]]
+    final = events[-1]
+
+    assert tokens and all("token" in event for event in events[:-1])
+    assert "".join(tokens) == final["answer"]
+    assert final["answer"] == graph.invoke(question)["answer"]
+    assert "router" not in "".join(tokens) and "retriever" not in "".join(tokens)
+
+
+def test_sources_stripper_matches_strip_sources():
+    rng = random.Random(0)
+    pieces = ["Revenue", " grew", "  ", "\n", "SOURCES", ":", "SOU", "RCES:", " call.pdf", "S", "OURCE", "x"]
+    for _ in range(2000):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+        cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 6))))
+        tokens = [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+
+        for marker, expected in ((None, text.strip()), ("SOURCES:", strip_sources(text))):
+            stripper = SourcesStripper(marker=marker) if marker is None else SourcesStripper()
+            streamed = "".join(stripper.feed(token) for token in tokens) + stripper.flush()
+            assert streamed == expected, (tokens, marker)